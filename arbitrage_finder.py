@@ -1,4 +1,4 @@
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 import asyncio
 from web3 import Web3
 import logging
@@ -8,8 +8,15 @@ from config import MIN_PROFIT_THRESHOLD, MAX_SLIPPAGE
 logger = logging.getLogger(__name__)
 
 class ArbitrageFinder:
-    def __init__(self, dexes: List[DEXInterface]):
+    def __init__(self, dexes: List[DEXInterface], chain: str = ''):
         self.dexes = dexes
+        self.chain = chain
+        self.min_profit_threshold = MIN_PROFIT_THRESHOLD
+        self.max_slippage = MAX_SLIPPAGE
+        
+    def apply_config(self, config):
+        self.min_profit_threshold = config.min_profit.get(self.chain, config.min_profit_threshold)
+        self.max_slippage = config.max_slippage
         
     async def find_opportunity(self, token_pair: Tuple[str, str], amount: int) -> Optional[Dict]:
         prices = await asyncio.gather(*[
@@ -20,16 +27,27 @@ class ArbitrageFinder:
         best_buy = min(prices)
         best_sell = max(prices)
         
-        profit = best_sell - best_buy
-        profit_usd = self._calculate_usd_profit(profit, token_pair[1])
+        # Cheap screen on the output-side spread before quoting the way back
+        if self._calculate_usd_profit(best_sell - best_buy, token_pair[1]) <= self.min_profit_threshold:
+            return None
+            
+        # Round trip: sell on the best venue, buy the input token back on the other.
+        # Profit is what comes back over the principal, in input (loan) token units
+        buy_dex = self.dexes[prices.index(best_buy)]
+        returned = await buy_dex.get_price(token_pair[1], token_pair[0], best_sell)
+        profit = returned - amount
+        profit_usd = self._calculate_usd_profit(profit, token_pair[0])
         
-        if profit_usd > MIN_PROFIT_THRESHOLD:
+        if profit_usd > self.min_profit_threshold:
             return {
-                'buy_dex': self.dexes[prices.index(best_buy)],
+                'buy_dex': buy_dex,
                 'sell_dex': self.dexes[prices.index(best_sell)],
+                'token_pair': token_pair,
+                'profit': profit,
                 'profit_usd': profit_usd,
                 'amount_in': amount,
-                'min_out': int(best_buy * (1 - MAX_SLIPPAGE / 100))
+                'amount_out': best_sell,
+                'min_out': int(best_buy * (1 - self.max_slippage / 100))
             }
         return None
         
@@ -0,0 +1,155 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from codec import CallEncoder, encode
+
+logger = logging.getLogger(__name__)
+
+# FlashLoanArbitrage.Swap[] and the owner entry points that borrow for it, per provider
+SWAPS_TYPE = '(address,address,address,uint256,uint256,uint8)[]'
+REQUEST_FLASH_LOAN = {
+    'aave': CallEncoder('requestFlashLoan(address,uint256,bytes)'),
+    'balancer': CallEncoder('requestBalancerFlashLoan(address,uint256,bytes)'),
+}
+
+# Router call a Swap hop makes (FlashLoanArbitrage.SWAP_*); Camelot's V2 router
+# has no swapExactTokensForTokens, only the fee-on-transfer variant
+SWAP_UNISWAP_V2 = 0
+SWAP_CAMELOT = 1
+SWAP_KINDS = {'sushiswap': SWAP_UNISWAP_V2, 'camelot': SWAP_CAMELOT}
+
+
+@dataclass
+class SwapLeg:
+    router: str
+    token_in: str
+    token_out: str
+    amount_in: int  # 0 spends the contract's whole token_in balance
+    min_amount_out: int
+    kind: int = SWAP_UNISWAP_V2
+
+
+@dataclass
+class Opportunity:
+    legs: List[SwapLeg]
+    loan_token: str
+    loan_amount: int
+    profit: int  # in loan_token units, before gas
+    reads: FrozenSet[str]  # pools whose state the quote depends on
+    writes: FrozenSet[str]  # pools the legs trade against
+    block_number: int = 0
+    value: float = 0.0  # profit normalised across loan tokens (USD); ranks opportunities
+
+    def conflicts_with(self, other: 'Opportunity') -> bool:
+        return bool(
+            self.writes & (other.reads | other.writes)
+            or self.reads & other.writes
+        )
+
+
+@dataclass
+class Bundle:
+    loan_token: str
+    loan_amount: int
+    opportunities: List[Opportunity] = field(default_factory=list)
+
+    @property
+    def legs(self) -> List[SwapLeg]:
+        return [leg for opportunity in self.opportunities for leg in opportunity.legs]
+
+    @property
+    def profit(self) -> int:
+        return sum(opportunity.profit for opportunity in self.opportunities)
+
+    def encode_params(self) -> bytes:
+        return encode([SWAPS_TYPE], [[
+            (leg.router, leg.token_in, leg.token_out, leg.amount_in, leg.min_amount_out, leg.kind)
+            for leg in self.legs
+        ]])
+
+    def encode_call(self, provider: str = 'aave') -> bytes:
+        """Calldata for the FlashLoanArbitrage entry point borrowing from ``provider``"""
+        return REQUEST_FLASH_LOAN[provider].encode((self.loan_token, self.loan_amount, self.encode_params()))
+
+
+class BundleBuilder:
+    """Packs non-conflicting opportunities from a window of blocks into bundles.
+
+    A window opens at the block of the first opportunity added after a flush
+    and is due once ``window_blocks`` blocks have been mined past it; callers
+    add opportunities as their polls find them and flush when ``due``.
+    Opportunities are taken greedily by normalised value and dropped when
+    their pool read/write sets overlap an already accepted one, since the
+    earlier swap would move the price the later quote relied on. Accepted
+    opportunities that borrow the same token share one flash loan: the legs
+    run back to back, each opportunity repays its principal before the next
+    starts, so the loan only needs to cover the largest of them.
+    """
+
+    def __init__(self, window_blocks: int = 1, max_legs: int = 12):
+        self.window_blocks = window_blocks
+        self.max_legs = max_legs
+        self.pending: List[Opportunity] = []
+        self.window_start: Optional[int] = None
+        # (pools, block) already queued or submitted; the same quote seen again
+        # by a later poll of the same block must not become a second transaction
+        self._seen: Set[Tuple[FrozenSet[str], int]] = set()
+
+    def apply_config(self, config):
+        self.window_blocks = config.bundle_window_blocks
+        self.max_legs = config.bundle_max_legs
+
+    def add(self, opportunity: Opportunity) -> bool:
+        # Without known pools an opportunity would never conflict with anything
+        if not opportunity.writes:
+            logger.debug(f"Rejected opportunity on {opportunity.loan_token} with no known pools")
+            return False
+        key = (opportunity.writes, opportunity.block_number)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self.pending.append(opportunity)
+        if self.window_start is None:
+            self.window_start = opportunity.block_number
+        return True
+
+    def due(self, block_number: int) -> bool:
+        """Whether the open window is complete now that ``block_number`` is mined"""
+        return self.window_start is not None and block_number - self.window_start >= self.window_blocks
+
+    def flush(self, block_number: int) -> List[Bundle]:
+        """Bundle the window collected before ``block_number``, the first block past it"""
+        # Quotes from before the window (e.g. after skipped polls) are stale
+        fresh = [
+            opportunity for opportunity in self.pending
+            if block_number - opportunity.block_number <= self.window_blocks
+        ]
+        self.pending = []
+        self.window_start = None
+        self._seen = {key for key in self._seen if key[1] >= block_number}
+
+        accepted: List[Opportunity] = []
+        # Rank on the normalised value: raw profits are in different tokens and decimals
+        for opportunity in sorted(fresh, key=lambda o: o.value, reverse=True):
+            if any(opportunity.conflicts_with(other) for other in accepted):
+                continue
+            accepted.append(opportunity)
+
+        bundles: Dict[str, List[Bundle]] = defaultdict(list)
+        for opportunity in accepted:
+            group = bundles[opportunity.loan_token]
+            if not group or len(group[-1].legs) + len(opportunity.legs) > self.max_legs:
+                group.append(Bundle(opportunity.loan_token, 0))
+            bundle = group[-1]
+            bundle.opportunities.append(opportunity)
+            bundle.loan_amount = max(bundle.loan_amount, opportunity.loan_amount)
+
+        result = [bundle for group in bundles.values() for bundle in group]
+        if fresh:
+            logger.info(
+                f"Packed {len(accepted)}/{len(fresh)} opportunities into {len(result)} bundles "
+                f"at block {block_number}"
+            )
+        return result
@@ -0,0 +1,293 @@
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from typing import Callable, Dict, List, Optional, Set
+
+from config import (
+    MEMPOOL_CHAINS, MEMPOOL_MAX_GAS, MEMPOOL_MIN_SWAP_VALUE, MEMPOOL_SHARDS,
+    MIN_PROFIT_THRESHOLD, RPC_URLS, WS_URLS
+)
+from mempool_monitor import Chain, EnhancedMempoolMonitor, MempoolConfig
+from profiler import start_profiler
+from rpc_provider import close_endpoints
+from runtime_config import RuntimeConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ShardSpec:
+    chains: List[Chain]
+    cpus: Optional[Set[int]] = None  # CPU affinity for the worker process
+
+
+@dataclass
+class _Shard:
+    spec: ShardSpec
+    configs: List[MempoolConfig]
+    process: Optional[mp.Process] = None
+    conn: Optional[Connection] = None
+    restarts: int = 0
+    next_start: float = 0.0
+    latencies: Dict[Chain, deque] = field(default_factory=dict)
+
+
+def _pin_cpus(cpus: Optional[Set[int]]):
+    if not cpus:
+        return
+    if not hasattr(os, 'sched_setaffinity'):
+        logger.warning("CPU pinning not supported on this platform")
+        return
+    os.sched_setaffinity(0, cpus)
+
+
+def _worker_main(configs: List[MempoolConfig], conn: Connection, stop_event, cpus: Optional[Set[int]]):
+    """Entry point of a shard process: one event loop for its own chains"""
+    # force: spawn re-imports the parent's main module, which may configure logging first
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s',
+        force=True
+    )
+    _pin_cpus(cpus)
+    # Ctrl-C reaches the whole process group; shutdown is driven by stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    async def forward(tx_data: Dict):
+        conn.send((time.time(), tx_data))
+
+    async def run():
+        monitor = EnhancedMempoolMonitor(configs, forward)
+        # Each shard watches the runtime config file itself, so no reload IPC is needed
+        runtime_config = RuntimeConfig()
+        runtime_config.load()
+        runtime_config.subscribe(monitor.apply_config)
+        # Per-shard profiler; `kill -USR2 <pid>` dumps that shard's stacks
+        profiler = start_profiler()
+        task = asyncio.create_task(monitor.start())
+        config_task = asyncio.create_task(runtime_config.watch())
+        while not stop_event.is_set() and not task.done():
+            await asyncio.sleep(0.2)
+        runtime_config.stop()
+        task.cancel()
+        config_task.cancel()
+        await asyncio.gather(task, config_task, return_exceptions=True)
+        await monitor.close()
+        await close_endpoints()
+        if profiler:
+            profiler.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+
+
+class ChainSupervisor:
+    """Runs EnhancedMempoolMonitor shards in separate processes.
+
+    Each shard owns a subset of chains and its own event loop, so a flood on
+    one chain cannot add latency to another. Opportunities come back over a
+    per-shard pipe and are handed to ``callback`` on the coordinator loop.
+    Crashed shards are restarted with exponential backoff, and IPC latency
+    is logged every ``stats_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        configs: List[MempoolConfig],
+        callback: Callable,
+        shards: Optional[List[ShardSpec]] = None,
+        restart_delay: float = 1.0,
+        max_restart_delay: float = 30.0,
+        processors: int = 4,
+        stats_interval: float = 60.0
+    ):
+        self.callback = callback
+        self.stats_interval = stats_interval
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.processors = processors
+        self.ctx = mp.get_context('spawn')
+        self.stop_event = self.ctx.Event()
+        self.results: asyncio.Queue = asyncio.Queue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = False
+
+        by_chain = {config.chain: config for config in configs}
+        specs = shards or [ShardSpec(chains=[config.chain]) for config in configs]
+        self.shards = [
+            _Shard(spec=spec, configs=[by_chain[chain] for chain in spec.chains if chain in by_chain])
+            for spec in specs
+        ]
+
+    async def start(self):
+        self._running = True
+        self._loop = asyncio.get_running_loop()
+        for shard in self.shards:
+            self._spawn(shard)
+
+        try:
+            await asyncio.gather(
+                self._supervise(),
+                self._report_latency(),
+                *[self._process_results() for _ in range(self.processors)]
+            )
+        finally:
+            await self.stop()
+
+    def _spawn(self, shard: _Shard):
+        reader, writer = self.ctx.Pipe(duplex=False)
+        shard.process = self.ctx.Process(
+            target=_worker_main,
+            args=(shard.configs, writer, self.stop_event, shard.spec.cpus),
+            name=f"mempool-{'-'.join(c.value for c in shard.spec.chains)}",
+            daemon=True
+        )
+        shard.process.start()
+        writer.close()
+        shard.conn = reader
+        self._loop.add_reader(reader.fileno(), self._drain, shard)
+        logger.info(f"Started shard {shard.process.name} (pid {shard.process.pid})")
+
+    def _drain(self, shard: _Shard):
+        try:
+            while shard.conn.poll():
+                sent_at, tx_data = shard.conn.recv()
+                chain = tx_data.get('chain')
+                shard.latencies.setdefault(chain, deque(maxlen=1000)).append(time.time() - sent_at)
+                self.results.put_nowait(tx_data)
+        except (EOFError, OSError):
+            # Worker exited; the supervisor loop handles the restart
+            self._close_conn(shard)
+
+    def _close_conn(self, shard: _Shard):
+        if shard.conn is not None:
+            self._loop.remove_reader(shard.conn.fileno())
+            shard.conn.close()
+            shard.conn = None
+
+    async def _supervise(self):
+        while self._running:
+            now = time.monotonic()
+            for shard in self.shards:
+                if shard.process is None or shard.process.is_alive():
+                    continue
+
+                if shard.next_start == 0.0:
+                    delay = min(self.restart_delay * 2 ** shard.restarts, self.max_restart_delay)
+                    shard.next_start = now + delay
+                    logger.error(
+                        f"Shard {shard.process.name} exited with code {shard.process.exitcode}, "
+                        f"restarting in {delay:.1f}s"
+                    )
+                elif now >= shard.next_start:
+                    self._close_conn(shard)
+                    shard.restarts += 1
+                    shard.next_start = 0.0
+                    self._spawn(shard)
+            await asyncio.sleep(0.5)
+
+    async def _process_results(self):
+        while self._running:
+            tx_data = await self.results.get()
+            try:
+                await self.callback(tx_data)
+            except Exception as e:
+                logger.error(f"Opportunity execution error: {e}")
+            finally:
+                self.results.task_done()
+
+    async def _report_latency(self):
+        while self._running:
+            await asyncio.sleep(self.stats_interval)
+            for chain, stats in self.latency_stats().items():
+                logger.info(f"IPC latency {chain.value}: p50 {stats['p50']:.2f}ms p99 {stats['p99']:.2f}ms")
+
+    def latency_stats(self) -> Dict[Chain, Dict[str, float]]:
+        """IPC latency per chain (worker send to coordinator receive), in ms"""
+        stats = {}
+        for shard in self.shards:
+            for chain, samples in shard.latencies.items():
+                ordered = sorted(samples)
+                if not ordered:
+                    continue
+                stats[chain] = {
+                    'p50': ordered[len(ordered) // 2] * 1000,
+                    'p99': ordered[int(len(ordered) * 0.99)] * 1000,
+                    'samples': len(ordered)
+                }
+        return stats
+
+    async def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self.stop_event.set()
+        # Workers get a moment to close their sockets; join off the event loop
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(None, shard.process.join, 2)
+            for shard in self.shards if shard.process is not None
+        ])
+        for shard in self.shards:
+            if shard.process is not None and shard.process.is_alive():
+                shard.process.terminate()
+            self._close_conn(shard)
+
+
+def parse_shards(spec: str) -> List[ShardSpec]:
+    """Shards from MEMPOOL_SHARDS: ';'-separated chain lists, each with optional '@' CPUs.
+
+    ``'ethereum,bsc@0-1;arbitrum@2'`` runs Ethereum and BSC in one process
+    pinned to CPUs 0 and 1, and Arbitrum in another pinned to CPU 2.
+    """
+    shards = []
+    for part in filter(None, (part.strip() for part in spec.split(';'))):
+        chains, _, cpus = part.partition('@')
+        shards.append(ShardSpec(
+            chains=[Chain(name.strip()) for name in chains.split(',') if name.strip()],
+            cpus=_parse_cpus(cpus) if cpus.strip() else None
+        ))
+    return shards
+
+
+def _parse_cpus(spec: str) -> Set[int]:
+    cpus: Set[int] = set()
+    for item in spec.split(','):
+        start, _, end = item.strip().partition('-')
+        cpus.update(range(int(start), int(end or start) + 1))
+    return cpus
+
+
+def build_configs(chains: List[str]) -> List[MempoolConfig]:
+    configs = []
+    for name in chains:
+        if name not in RPC_URLS:
+            raise ValueError(f"No RPC URL configured for mempool chain {name!r}")
+        configs.append(MempoolConfig(
+            chain=Chain(name),
+            rpc_urls=[RPC_URLS[name]],
+            ws_urls=[WS_URLS[name]] if WS_URLS.get(name) else [],
+            min_profit=MIN_PROFIT_THRESHOLD,
+            max_gas=MEMPOOL_MAX_GAS,
+            min_swap_value=MEMPOOL_MIN_SWAP_VALUE
+        ))
+    return configs
+
+
+def build_supervisor(callback: Callable) -> Optional[ChainSupervisor]:
+    """Supervisor for the configured mempool shards, or None when monitoring is off"""
+    shards = parse_shards(MEMPOOL_SHARDS)
+    chains = [chain.value for shard in shards for chain in shard.chains] if shards else MEMPOOL_CHAINS
+    if not chains:
+        return None
+    return ChainSupervisor(build_configs(chains), callback, shards or None)
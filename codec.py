@@ -0,0 +1,212 @@
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from eth_abi.abi import default_codec
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+
+# Fields kept from each subscription payload; True marks hex quantities decoded to int
+PENDING_TX_FIELDS = {
+    'hash': False, 'from': False, 'to': False, 'input': False,
+    'value': True, 'gas': True, 'gasPrice': True,
+    'maxFeePerGas': True, 'maxPriorityFeePerGas': True, 'nonce': True
+}
+HEADER_FIELDS = {
+    'hash': False, 'parentHash': False, 'miner': False,
+    'number': True, 'timestamp': True, 'gasUsed': True, 'gasLimit': True, 'baseFeePerGas': True
+}
+LOG_FIELDS = {
+    'address': False, 'topics': False, 'data': False, 'transactionHash': False, 'removed': False,
+    'blockNumber': True, 'logIndex': True
+}
+SCHEMAS = {'pending_tx': PENDING_TX_FIELDS, 'header': HEADER_FIELDS, 'log': LOG_FIELDS}
+
+# What a frame that does not match its schema raises from FrameDecoder; msgspec's
+# DecodeError/ValidationError and the json/orjson errors are all ValueErrors
+FRAME_ERRORS = (ValueError, TypeError, KeyError, AttributeError)
+
+
+if msgspec is not None:
+    class PendingTx(msgspec.Struct):
+        hash: str
+        sender: Optional[str] = msgspec.field(default=None, name='from')
+        to: Optional[str] = None
+        input: Optional[str] = None
+        value: Optional[str] = None
+        gas: Optional[str] = None
+        gasPrice: Optional[str] = None
+        maxFeePerGas: Optional[str] = None
+        maxPriorityFeePerGas: Optional[str] = None
+        nonce: Optional[str] = None
+
+    class Header(msgspec.Struct):
+        hash: str
+        parentHash: Optional[str] = None
+        miner: Optional[str] = None
+        number: Optional[str] = None
+        timestamp: Optional[str] = None
+        gasUsed: Optional[str] = None
+        gasLimit: Optional[str] = None
+        baseFeePerGas: Optional[str] = None
+
+    class Log(msgspec.Struct):
+        address: str
+        topics: List[str]
+        data: str
+        transactionHash: Optional[str] = None
+        removed: bool = False
+        blockNumber: Optional[str] = None
+        logIndex: Optional[str] = None
+
+    # newPendingTransactions yields bare hashes unless the node streams full bodies
+    class _PendingTxParams(msgspec.Struct):
+        subscription: str
+        result: Union[str, PendingTx]
+
+    class _HeaderParams(msgspec.Struct):
+        subscription: str
+        result: Header
+
+    class _LogParams(msgspec.Struct):
+        subscription: str
+        result: Log
+
+    class _PendingTxFrame(msgspec.Struct):
+        params: Optional[_PendingTxParams] = None
+
+    class _HeaderFrame(msgspec.Struct):
+        params: Optional[_HeaderParams] = None
+
+    class _LogFrame(msgspec.Struct):
+        params: Optional[_LogParams] = None
+
+    _FRAME_TYPES = {'pending_tx': _PendingTxFrame, 'header': _HeaderFrame, 'log': _LogFrame}
+
+
+def _quantity(value: Optional[str]) -> Optional[int]:
+    return int(value, 16) if value is not None else None
+
+
+class FrameDecoder:
+    """Decodes eth_subscription frames of one kind into plain dicts.
+
+    With msgspec installed, frames are parsed straight into typed structs
+    that skip every field not listed in the schema; otherwise orjson (or
+    json) parses the frame and the schema fields are picked from the dict.
+    Subscription acks and other non-notification frames decode to None;
+    malformed frames raise one of FRAME_ERRORS.
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.fields = SCHEMAS[kind]
+        self._attrs = [
+            (name, 'sender' if name == 'from' else name, is_quantity)
+            for name, is_quantity in self.fields.items()
+        ]
+        self._decoder = msgspec.json.Decoder(_FRAME_TYPES[kind]) if msgspec is not None else None
+
+    def decode(self, raw: Union[str, bytes]) -> Optional[Dict]:
+        if self._decoder is not None:
+            frame = self._decoder.decode(raw)
+            if frame.params is None:
+                return None
+            result = frame.params.result
+            if isinstance(result, str):
+                return {'hash': result}
+            return {
+                name: _quantity(getattr(result, attr)) if is_quantity else getattr(result, attr)
+                for name, attr, is_quantity in self._attrs
+            }
+
+        frame = json_loads(raw)
+        params = frame.get('params') if isinstance(frame, dict) else None
+        if not params:
+            return None
+        return self.from_dict(params['result'])
+
+    def from_dict(self, result: Union[str, Dict]) -> Dict:
+        """Normalise an already-parsed payload (e.g. from HTTP polling)"""
+        if isinstance(result, str):
+            return {'hash': result}
+        out = {}
+        for name, is_quantity in self.fields.items():
+            value = result.get(name)
+            if is_quantity and isinstance(value, str):
+                value = int(value, 16)
+            elif isinstance(value, bytes):
+                value = Web3.to_hex(value)
+            out[name] = value
+        return out
+
+
+@lru_cache(maxsize=None)
+def get_encoder(*types: str) -> Callable[[Sequence], bytes]:
+    """Compiled eth_abi tuple encoder for ``types``, built once per shape"""
+    return default_codec._registry.get_tuple_encoder(*types)
+
+
+def encode(types: Sequence[str], args: Sequence) -> bytes:
+    return get_encoder(*types)(args)
+
+
+def encode_bytes(data: bytes) -> bytes:
+    """abi.encode(bytes) without going through the encoder registry"""
+    padded = data + b'\x00' * (-len(data) % 32)
+    return (32).to_bytes(32, 'big') + len(data).to_bytes(32, 'big') + padded
+
+
+def _split_types(signature_args: str) -> Tuple[str, ...]:
+    # Split top-level comma separated types, keeping nested tuples intact
+    types, depth, current = [], 0, ''
+    for char in signature_args:
+        if char == ',' and depth == 0:
+            types.append(current)
+            current = ''
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        current += char
+    if current:
+        types.append(current)
+    return tuple(types)
+
+
+class CallEncoder:
+    """Calldata encoder for one function signature with a cached selector and encoder"""
+
+    def __init__(self, signature: str):
+        _, _, args = signature.partition('(')
+        self.signature = signature
+        self.selector = Web3.keccak(text=signature)[:4]
+        self.types = _split_types(args[:-1])
+        self._encode = get_encoder(*self.types)
+
+    def encode(self, args: Sequence) -> bytes:
+        return self.selector + self._encode(args)
+
+    def encode_hex(self, args: Sequence) -> str:
+        return '0x' + self.encode(args).hex()
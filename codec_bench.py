@@ -0,0 +1,95 @@
+"""Microbenchmark for the RPC hot loop codecs.
+
+Compares per-message parse cost of a full pending-transaction frame
+(json + web3 result formatters vs codec.FrameDecoder) and per-loan
+calldata encode cost (web3 contract + eth_abi vs codec.CallEncoder).
+
+    python codec_bench.py --iterations 20000
+"""
+import argparse
+import json
+import timeit
+
+import eth_abi
+from web3 import Web3
+from web3._utils.method_formatters import transaction_result_formatter
+
+import codec
+from flash_loan import FlashLoanProvider
+from flash_loan_router import FLASH_LOAN_PROVIDERS
+
+FRAME = json.dumps({
+    'jsonrpc': '2.0',
+    'method': 'eth_subscription',
+    'params': {
+        'subscription': '0x9ce59a13059e417087c02d3236a0b1cc',
+        'result': {
+            'blockHash': None, 'blockNumber': None, 'transactionIndex': None,
+            'hash': '0x' + '1f' * 32,
+            'from': '0x7a250d5630b4cf539739df2c5dacb4c659f2488d',
+            'to': '0x68b3465833fb72a70ecdf485e0e4c7bd8665fc45',
+            'gas': '0x3d090', 'gasPrice': '0x12a05f200',
+            'maxFeePerGas': '0x12a05f200', 'maxPriorityFeePerGas': '0x3b9aca00',
+            'value': '0xde0b6b3a7640000', 'nonce': '0x2a', 'type': '0x2', 'chainId': '0x1',
+            'input': '0x38ed1739' + '00' * 196,
+            'accessList': [], 'v': '0x1', 'r': '0x' + 'ab' * 32, 's': '0x' + 'cd' * 32
+        }
+    }
+}).encode()
+
+AAVE_ABI = [{
+    'inputs': [
+        {'name': 'receiverAddress', 'type': 'address'}, {'name': 'assets', 'type': 'address[]'},
+        {'name': 'amounts', 'type': 'uint256[]'}, {'name': 'modes', 'type': 'uint256[]'},
+        {'name': 'onBehalfOf', 'type': 'address'}, {'name': 'params', 'type': 'bytes'},
+        {'name': 'referralCode', 'type': 'uint16'}
+    ],
+    'name': 'flashLoan', 'outputs': [], 'stateMutability': 'nonpayable', 'type': 'function'
+}]
+RECEIVER = '0x000000000000000000000000000000000000dEaD'
+ASSETS = ['0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2']
+CALLBACK = b'\x01' * 96
+
+
+def parse_baseline():
+    frame = json.loads(FRAME)
+    return transaction_result_formatter(frame['params']['result'])
+
+
+def encode_baseline(contract):
+    params = eth_abi.encode(['bytes'], [CALLBACK])
+    return contract.functions.flashLoan(
+        RECEIVER, ASSETS, [10 ** 21], [0], RECEIVER, params, 0
+    )._encode_transaction_data()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    decoder = codec.FrameDecoder('pending_tx')
+    contract = Web3().eth.contract(address=FLASH_LOAN_PROVIDERS['ethereum']['aave'], abi=AAVE_ABI)
+    encoder = codec.CallEncoder(FlashLoanProvider.LOAN_SIGNATURES['aave'])
+
+    def encode_fast():
+        return encoder.encode((RECEIVER, ASSETS, [10 ** 21], [0], RECEIVER, codec.encode_bytes(CALLBACK), 0))
+
+    assert encode_fast() == bytes.fromhex(encode_baseline(contract)[2:])
+
+    results = {
+        'parse_baseline_us': timeit.timeit(parse_baseline, number=n) / n * 1e6,
+        'parse_codec_us': timeit.timeit(lambda: decoder.decode(FRAME), number=n) / n * 1e6,
+        'encode_baseline_us': timeit.timeit(lambda: encode_baseline(contract), number=n // 10) / (n // 10) * 1e6,
+        'encode_codec_us': timeit.timeit(encode_fast, number=n) / n * 1e6,
+    }
+    results['parse_speedup'] = results['parse_baseline_us'] / results['parse_codec_us']
+    results['encode_speedup'] = results['encode_baseline_us'] / results['encode_codec_us']
+    results['json_backend'] = 'msgspec' if codec.msgspec else 'orjson' if codec.orjson else 'json'
+
+    print(json.dumps({k: round(v, 2) if isinstance(v, float) else v for k, v in results.items()}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -15,27 +15,85 @@ WS_ENDPOINTS = [
     "wss://solana-api.projectserum.com"
 ]
 
+# EVM Network Configuration
+NETWORK = os.getenv('NETWORK', 'arbitrum')
+RPC_URLS = {
+    'arbitrum': os.getenv('ARBITRUM_RPC_URL', 'https://arb1.arbitrum.io/rpc'),
+    'ethereum': os.getenv('ETH_RPC_URL', 'https://eth.llamarpc.com'),
+}
+ETH_NODE_URL = RPC_URLS['ethereum']
+
 # Account Settings
 PRIVATE_KEY = os.getenv('PRIVATE_KEY', '')
-PUBLIC_KEY = base58.b58encode(base58.b58decode(PRIVATE_KEY)[32:]).decode() if PRIVATE_KEY else ''
+# Solana keypairs are base58; EVM keys are 0x-prefixed hex and have no Solana public key
+PUBLIC_KEY = (
+    base58.b58encode(base58.b58decode(PRIVATE_KEY)[32:]).decode()
+    if PRIVATE_KEY and not PRIVATE_KEY.startswith('0x') else ''
+)
 
 # DEX Settings
-RAYDIUM_POOLS = {
-    'SOL/USDC': 'xxxxx',  # Replace with actual pool addresses
-    'SOL/USDT': 'xxxxx',
+SUSHI_ROUTER = '0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506'
+CAMELOT_ROUTER = '0xc873fEcbd354f5A56E00E710B90EF4201db2448d'
+
+# Pool Discovery
+POOL_DB_PATH = os.getenv('POOL_DB_PATH', 'data/pools.sqlite')
+POOL_INDEX_INTERVAL = 15  # seconds between incremental catch-ups
+POOL_RESERVE_INTERVAL = 15  # seconds between reserve refreshes of tradable pools (the pair screen reads them)
+# start_block is the factory deployment block; the first sync scans from there
+POOL_FACTORIES = {
+    'arbitrum': [
+        {'name': 'sushiswap', 'address': '0xc35DADB65012eC5796536bD9864eD8773aBc74C4', 'kind': 'v2', 'fee_bps': 30,
+         'start_block': 70},
+        {'name': 'camelot', 'address': '0x6EcCab422D763aC031210895C81787E87B43A652', 'kind': 'v2', 'fee_bps': 30,
+         'start_block': 35061163},
+        {'name': 'uniswap_v3', 'address': '0x1F98431c8aD98523631AE4a59f267346ea31F984', 'kind': 'v3',
+         'start_block': 165},
+    ]
+}
+
+# Solana AMM programs whose pool accounts are indexed into the same store
+SOLANA_AMM_PROGRAMS = {
+    'raydium': os.getenv('RAYDIUM_AMM_PROGRAM', '675kPX9MHTjS2zt1qfr1NYHmZeoczLfmA8Mnc8Mp1NxS'),
+    'orca': os.getenv('ORCA_WHIRLPOOL_PROGRAM', 'whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc'),
 }
-ORCA_POOLS = {
-    'SOL/USDC': 'xxxxx',
-    'SOL/USDT': 'xxxxx',
+
+# Mempool monitoring: the bot runs shard processes whose decoded pending swaps
+# feed its opportunity scan. Empty MEMPOOL_CHAINS and MEMPOOL_SHARDS turn it off
+MEMPOOL_CHAINS = [chain for chain in os.getenv('MEMPOOL_CHAINS', '').split(',') if chain]  # one shard each
+MEMPOOL_SHARDS = os.getenv('MEMPOOL_SHARDS', '')  # e.g. 'ethereum,bsc@0-1;arbitrum@2'; overrides MEMPOOL_CHAINS
+MEMPOOL_PAIR_TTL = 15  # seconds a pair touched by a pending swap keeps being quoted
+WS_URLS = {
+    'arbitrum': os.getenv('ARBITRUM_WS_URL', ''),
+    'ethereum': os.getenv('ETH_WS_URL', ''),
 }
+MEMPOOL_MAX_GAS = 300 * 10 ** 9  # wei
+MEMPOOL_MIN_SWAP_VALUE = 1.0  # native token; smaller swaps rarely move a pool enough to backrun
+MEMPOOL_PROCESSORS = 4  # opportunity processor tasks per shard
+
+# Bundling
+FLASH_LOAN_CONTRACT = os.getenv('FLASH_LOAN_CONTRACT', '')  # deployed FlashLoanArbitrage
+BUNDLE_WINDOW_BLOCKS = 1
+BUNDLE_MAX_LEGS = 12
+
+# Profiling (always-on sampler; SIGUSR2 or the admin endpoint dumps stacks)
+PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', '1') == '1'
+PROFILER_HZ = float(os.getenv('PROFILER_HZ', '49'))
+LOOP_LAG_THRESHOLD_MS = float(os.getenv('LOOP_LAG_THRESHOLD_MS', '50'))
+PROFILER_ADMIN_PORT = int(os.getenv('PROFILER_ADMIN_PORT', '0'))  # 0 disables the endpoint
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
 
 # Performance Settings
 PARALLEL_EXECUTIONS = 3
 EXECUTION_TIMEOUT = 2  # seconds
 MIN_PROFIT_SOL = 0.01
+MIN_PROFIT_THRESHOLD = 1.0  # USD
+MAX_PRIORITY_FEE = 0.01  # gwei
 MAX_RETRIES = 3
+POLL_INTERVAL = 0.1  # seconds between opportunity scans
+MAX_QUOTED_PAIRS = 20  # pairs quoted on-chain per scan, after screening on stored reserves
 
 # Risk Management
 MAX_POSITION_SIZE = 0.5  # SOL
 SLIPPAGE_TOLERANCE = 0.5  # %
+MAX_SLIPPAGE = SLIPPAGE_TOLERANCE
 CIRCUIT_BREAKER = -1  # SOL
\ No newline at end of file
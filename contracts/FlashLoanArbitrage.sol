@@ -5,13 +5,61 @@ import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
 import "@aave/core-v3/contracts/flashloan/base/FlashLoanSimpleReceiverBase.sol";
 import "@aave/core-v3/contracts/interfaces/IPoolAddressesProvider.sol";
 
+interface IUniswapV2Router {
+    function swapExactTokensForTokens(
+        uint256 amountIn,
+        uint256 amountOutMin,
+        address[] calldata path,
+        address to,
+        uint256 deadline
+    ) external returns (uint256[] memory amounts);
+}
+
+// Camelot's V2 router only has the fee-on-transfer swap variants, with a referrer
+interface ICamelotRouter {
+    function swapExactTokensForTokensSupportingFeeOnTransferTokens(
+        uint256 amountIn,
+        uint256 amountOutMin,
+        address[] calldata path,
+        address to,
+        address referrer,
+        uint256 deadline
+    ) external;
+}
+
+interface IBalancerVault {
+    function flashLoan(
+        address recipient,
+        IERC20[] memory tokens,
+        uint256[] memory amounts,
+        bytes memory userData
+    ) external;
+}
+
 contract FlashLoanArbitrage is FlashLoanSimpleReceiverBase {
     address public owner;
+    IBalancerVault public immutable VAULT;
+    bool private _balancerLoanActive;
+    
+    // Router call used for a hop
+    uint8 constant SWAP_UNISWAP_V2 = 0;
+    uint8 constant SWAP_CAMELOT = 1;
+    
+    // One hop of a bundle; amountIn == 0 spends the whole tokenIn balance
+    struct Swap {
+        address router;
+        address tokenIn;
+        address tokenOut;
+        uint256 amountIn;
+        uint256 minAmountOut;
+        uint8 kind;
+    }
     
-    constructor(address _addressProvider) 
+    constructor(address _addressProvider, address _vault) 
         FlashLoanSimpleReceiverBase(IPoolAddressesProvider(_addressProvider)) 
     {
         owner = msg.sender;
+        VAULT = IBalancerVault(_vault);
     }
     
     function executeOperation(
@@ -21,21 +69,41 @@ contract FlashLoanArbitrage is FlashLoanSimpleReceiverBase {
         address initiator,
         bytes calldata params
     ) external override returns (bool) {
-        // Decode arbitrage parameters
-        (address tokenIn, address tokenOut, uint256 tradeAmount) = 
-            abi.decode(params, (address, address, uint256));
-            
-        // Execute arbitrage logic here
-        // 1. Trade on DEX A
-        // 2. Trade on DEX B
+        require(msg.sender == address(POOL), "Only pool");
+        require(initiator == address(this), "Only self");
+        
+        // Decode the bundled swaps and run them in order on the borrowed funds
+        Swap[] memory swaps = abi.decode(params, (Swap[]));
+        _executeSwaps(swaps);
         
         // Approve repayment
         uint256 amountToRepay = amount + premium;
+        require(IERC20(asset).balanceOf(address(this)) >= amountToRepay, "Unprofitable bundle");
         IERC20(asset).approve(address(POOL), amountToRepay);
         
         return true;
     }
     
+    // Balancer Vault callback; the Vault passes no initiator, so only accept
+    // loans this contract requested itself
+    function receiveFlashLoan(
+        IERC20[] memory tokens,
+        uint256[] memory amounts,
+        uint256[] memory feeAmounts,
+        bytes memory userData
+    ) external {
+        require(msg.sender == address(VAULT), "Only vault");
+        require(_balancerLoanActive, "Only self");
+        
+        Swap[] memory swaps = abi.decode(userData, (Swap[]));
+        _executeSwaps(swaps);
+        
+        // Repay by transfer; the Vault checks its balance after the callback
+        uint256 amountToRepay = amounts[0] + feeAmounts[0];
+        require(tokens[0].balanceOf(address(this)) >= amountToRepay, "Unprofitable bundle");
+        tokens[0].transfer(address(VAULT), amountToRepay);
+    }
+    
     function requestFlashLoan(
         address token,
         uint256 amount,
@@ -51,6 +119,55 @@ contract FlashLoanArbitrage is FlashLoanSimpleReceiverBase {
         );
     }
     
+    function requestBalancerFlashLoan(
+        address token,
+        uint256 amount,
+        bytes calldata params
+    ) external {
+        require(msg.sender == owner, "Only owner");
+        IERC20[] memory tokens = new IERC20[](1);
+        uint256[] memory amounts = new uint256[](1);
+        tokens[0] = IERC20(token);
+        amounts[0] = amount;
+        
+        _balancerLoanActive = true;
+        VAULT.flashLoan(address(this), tokens, amounts, params);
+        _balancerLoanActive = false;
+    }
+    
+    function _executeSwaps(Swap[] memory swaps) internal {
+        address[] memory path = new address[](2);
+        for (uint256 i = 0; i < swaps.length; i++) {
+            Swap memory swap = swaps[i];
+            uint256 amountIn = swap.amountIn == 0
+                ? IERC20(swap.tokenIn).balanceOf(address(this))
+                : swap.amountIn;
+            
+            path[0] = swap.tokenIn;
+            path[1] = swap.tokenOut;
+            IERC20(swap.tokenIn).approve(swap.router, amountIn);
+            if (swap.kind == SWAP_CAMELOT) {
+                ICamelotRouter(swap.router).swapExactTokensForTokensSupportingFeeOnTransferTokens(
+                    amountIn,
+                    swap.minAmountOut,
+                    path,
+                    address(this),
+                    address(0),
+                    block.timestamp
+                );
+            } else {
+                require(swap.kind == SWAP_UNISWAP_V2, "Unknown swap kind");
+                IUniswapV2Router(swap.router).swapExactTokensForTokens(
+                    amountIn,
+                    swap.minAmountOut,
+                    path,
+                    address(this),
+                    block.timestamp
+                );
+            }
+        }
+    }
+    
     function withdraw(address token) external {
         require(msg.sender == owner, "Only owner");
         IERC20 asset = IERC20(token);
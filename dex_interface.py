@@ -1,15 +1,17 @@
-from web3 import Web3
+from web3 import AsyncWeb3, Web3
 from typing import Dict, List, Tuple
 import json
 import asyncio
 from eth_account import Account
 import logging
+from config import PRIVATE_KEY, MAX_PRIORITY_FEE
 
 logger = logging.getLogger(__name__)
 
 class DEXInterface:
-    def __init__(self, web3: Web3, router_address: str, router_abi: str):
+    def __init__(self, web3: AsyncWeb3, router_address: str, router_abi: str, name: str = ''):
         self.w3 = web3
+        self.name = name
         self.router = self.w3.eth.contract(
             address=router_address,
             abi=router_abi
@@ -17,10 +19,11 @@ class DEXInterface:
         
     async def get_price(self, token_in: str, token_out: str, amount_in: int) -> int:
         try:
-            return await self.router.functions.getAmountsOut(
+            amounts = await self.router.functions.getAmountsOut(
                 amount_in,
                 [token_in, token_out]
             ).call()
+            return amounts[-1]
         except Exception as e:
             logger.error(f"Price fetch error: {e}")
             return 0
@@ -46,6 +49,6 @@ class DEXInterface:
                 ]
             ),
             'gas': 250000,
-            'maxFeePerGas': self.w3.eth.gas_price,
+            'maxFeePerGas': await self.w3.eth.gas_price,
             'maxPriorityFeePerGas': Web3.to_wei(MAX_PRIORITY_FEE, 'gwei')
         }
\ No newline at end of file
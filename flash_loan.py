@@ -1,52 +1,51 @@
-from web3 import Web3
-from typing import List, Dict, Optional
+from web3 import AsyncWeb3
+from eth_account.signers.local import LocalAccount
+from typing import Callable, List, Dict, Optional, Tuple
 import logging
-from eth_abi import encode_abi
 from decimal import Decimal
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
+from codec import CallEncoder, encode_bytes
+from flash_loan_router import DYDX_FLAT_FEE, DYDX_MARKETS, FLASH_LOAN_PROVIDERS, FlashLoanRouter
 
 logger = logging.getLogger(__name__)
 
 class FlashLoanProvider:
-    # Flash Loan Provider Addresses
-    PROVIDERS = {
-        'aave': '0x7d2768dE32b0b80b7a3454c06BdAc94A69DDc7A9',
-        'dydx': '0x1E0447b19BB6EcFdAe1e4AE1694b0C3659614e4e',
-        'balancer': '0xBA12222222228d8Ba445958a75a0704d566BF2C8'
+    # Loan entry points; calldata is encoded directly instead of through web3 contracts
+    LOAN_SIGNATURES = {
+        'aave': 'flashLoan(address,address[],uint256[],uint256[],address,bytes,uint16)',
+        'balancer': 'flashLoan(address,address[],uint256[],bytes)',
+        'dydx': 'operate((address,uint256)[],(uint8,uint256,(bool,uint8,uint8,uint256),uint256,uint256,address,uint256,bytes)[])'
     }
     
-    def __init__(self, w3: Web3, provider: str = 'aave'):
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        account: LocalAccount,
+        chain: str,
+        provider: str = 'aave',
+        router: Optional[FlashLoanRouter] = None
+    ):
         self.w3 = w3
-        self.provider = provider
+        self.account = account
+        self.chain = chain
+        self.providers = FLASH_LOAN_PROVIDERS[chain]
+        self.provider = provider  # Used when no router is attached
+        self.router = router
         self.executor = ThreadPoolExecutor(max_workers=4)
-        self.vault = self.w3.eth.contract(
-            address=self.PROVIDERS[provider],
-            abi=self._load_provider_abi()
-        )
         
-    def _load_provider_abi(self) -> str:
-        # Load appropriate ABI based on provider
-        abis = {
-            'aave': '''[
-                {"inputs":[{"internalType":"address[]","name":"assets","type":"address[]"},
-                {"internalType":"uint256[]","name":"amounts","type":"uint256[]"},
-                {"internalType":"uint256[]","name":"modes","type":"uint256[]"},
-                {"internalType":"address","name":"onBehalfOf","type":"address"},
-                {"internalType":"bytes","name":"params","type":"bytes"},
-                {"internalType":"uint16","name":"referralCode","type":"uint16"}],
-                "name":"flashLoan","outputs":[],"stateMutability":"nonpayable","type":"function"}
-            ]''',
-            'balancer': '''[
-                {"inputs":[{"internalType":"bytes32","name":"poolId","type":"bytes32"},
-                {"internalType":"address","name":"recipient","type":"address"},
-                {"internalType":"address[]","name":"tokens","type":"address[]"},
-                {"internalType":"uint256[]","name":"amounts","type":"uint256[]"},
-                {"internalType":"bytes","name":"userData","type":"bytes"}],
-                "name":"flashLoan","outputs":[],"stateMutability":"nonpayable","type":"function"}
-            ]'''
+        # Compile every provider's calldata encoder once instead of per loan
+        self.loan_encoders = {
+            name: CallEncoder(signature)
+            for name, signature in self.LOAN_SIGNATURES.items()
+        }
+        self.param_templates: Dict[str, Callable] = {
+            'aave': self._aave_params,
+            'balancer': self._balancer_params,
+            'dydx': self._dydx_params
         }
-        return abis.get(self.provider, abis['aave'])
+        self._aave_modes: Dict[int, List[int]] = {}
+        self._chain_id: Optional[int] = None
         
     async def execute_flash_loan(
         self,
@@ -57,24 +56,27 @@ class FlashLoanProvider:
     ) -> Dict:
         """Execute flash loan with optimized gas and error handling"""
         try:
-            # Validate minimum capital requirements
-            total_value = sum(amounts)
-            if total_value < Web3.to_wei(100, 'ether'):  # 100 USDT minimum
-                raise ValueError("Insufficient capital for flash loan")
+            if not amounts or min(amounts) <= 0:
+                raise ValueError("Flash loan amounts must be positive")
+
+            # Route to the cheapest provider that can fund every leg
+            provider, fee = self._select_provider(tokens, amounts)
 
             # Prepare flash loan parameters
-            loan_params = await self._prepare_loan_params(tokens, amounts, strategy_data)
+            loan_params = await self._prepare_loan_params(provider, tokens, amounts, strategy_data)
             
             # Estimate gas and optimize
-            gas_estimate = await self._estimate_gas(loan_params)
+            gas_estimate = await self._estimate_gas(provider, loan_params)
             gas_price = gas_price or await self._get_optimal_gas_price()
             
             # Execute transaction
-            tx_hash = await self._send_transaction(loan_params, gas_estimate, gas_price)
+            tx_hash = await self._send_transaction(provider, loan_params, gas_estimate, gas_price)
             receipt = await self._wait_for_confirmation(tx_hash)
             
             return {
                 'success': receipt.status == 1,
+                'provider': provider,
+                'fee': fee,
                 'tx_hash': tx_hash.hex(),
                 'gas_used': receipt.gasUsed,
                 'effective_gas_price': receipt.effectiveGasPrice
@@ -84,32 +86,66 @@ class FlashLoanProvider:
             logger.error(f"Flash loan execution failed: {e}")
             return {'success': False, 'error': str(e)}
             
-    async def _prepare_loan_params(self, tokens: List[str], amounts: List[int], strategy_data: Dict) -> Dict:
-        """Prepare optimized flash loan parameters based on provider"""
-        if self.provider == 'aave':
-            return {
-                'assets': tokens,
-                'amounts': amounts,
-                'modes': [0] * len(tokens),  # 0 = no debt, 1 = stable, 2 = variable
-                'onBehalfOf': self.w3.eth.default_account,
-                'params': encode_abi(['bytes'], [strategy_data.get('callback_data', b'')]),
-                'referralCode': 0
-            }
-        elif self.provider == 'balancer':
-            return {
-                'poolId': strategy_data['pool_id'],
-                'recipient': self.w3.eth.default_account,
-                'tokens': tokens,
-                'amounts': amounts,
-                'userData': strategy_data.get('callback_data', b'')
-            }
+    def _select_provider(self, tokens: List[str], amounts: List[int]) -> Tuple[str, int]:
+        if self.router is None:
+            return self.provider, 0
+        quote = self.router.select_many(tokens, amounts)
+        if quote is None:
+            raise ValueError("No flash loan provider has enough liquidity")
+        return quote.provider, sum(quote.fee(amount) for amount in amounts)
+        
+    async def _prepare_loan_params(
+        self,
+        provider: str,
+        tokens: List[str],
+        amounts: List[int],
+        strategy_data: Dict
+    ) -> Tuple:
+        """Fill the provider's positional argument template for flashLoan/operate"""
+        receiver = strategy_data.get('receiver', self.account.address)
+        callback_data = strategy_data.get('callback_data', b'')
+        return self.param_templates[provider](receiver, tokens, amounts, callback_data)
+        
+    def _aave_params(self, receiver: str, tokens: List[str], amounts: List[int], callback_data: bytes) -> Tuple:
+        modes = self._aave_modes.get(len(tokens))
+        if modes is None:
+            modes = self._aave_modes[len(tokens)] = [0] * len(tokens)  # 0 = no debt, 1 = stable, 2 = variable
+        return (
+            receiver,
+            tokens,
+            amounts,
+            modes,
+            self.account.address,
+            encode_bytes(callback_data),
+            0
+        )
+        
+    def _balancer_params(self, receiver: str, tokens: List[str], amounts: List[int], callback_data: bytes) -> Tuple:
+        return (receiver, tokens, amounts, callback_data)
+        
+    def _dydx_params(self, receiver: str, tokens: List[str], amounts: List[int], callback_data: bytes) -> Tuple:
+        if len(tokens) != 1:
+            raise ValueError("dYdX flash loans are single-asset")
+        # Withdraw -> Call -> Deposit (principal plus the 2 wei fee) on the receiver's account
+        market_id = DYDX_MARKETS[self.chain][tokens[0]]
+        amount = amounts[0]
+        return (
+            [(receiver, 1)],
+            [
+                (1, 0, (False, 0, 0, amount), market_id, 0, receiver, 0, b''),
+                (8, 0, (False, 0, 0, 0), 0, 0, receiver, 0, callback_data),
+                (0, 0, (True, 0, 0, amount + DYDX_FLAT_FEE), market_id, 0, receiver, 0, b'')
+            ]
+        )
             
-    async def _estimate_gas(self, params: Dict) -> int:
+    async def _estimate_gas(self, provider: str, params: Tuple) -> int:
         """Estimate gas cost with safety margin"""
         try:
-            base_estimate = await self.vault.functions.flashLoan(
-                *params.values()
-            ).estimate_gas()
+            base_estimate = await self.w3.eth.estimate_gas({
+                'from': self.account.address,
+                'to': self.providers[provider],
+                'data': self.loan_encoders[provider].encode(params)
+            })
             return int(base_estimate * 1.1)  # Add 10% safety margin
         except Exception as e:
             logger.error(f"Gas estimation failed: {e}")
@@ -117,23 +153,33 @@ class FlashLoanProvider:
             
     async def _get_optimal_gas_price(self) -> int:
         """Get optimal gas price based on network conditions"""
-        base_fee = self.w3.eth.get_block('latest').baseFeePerGas
-        priority_fee = self.w3.eth.max_priority_fee
-        return base_fee + priority_fee
+        block, priority_fee = await asyncio.gather(
+            self.w3.eth.get_block('latest'),
+            self.w3.eth.max_priority_fee
+        )
+        return block.baseFeePerGas + priority_fee
         
-    async def _send_transaction(self, params: Dict, gas_limit: int, gas_price: int) -> bytes:
+    async def _send_transaction(self, provider: str, params: Tuple, gas_limit: int, gas_price: int) -> bytes:
         """Send transaction with optimized parameters"""
-        tx = await self.vault.functions.flashLoan(
-            *params.values()
-        ).build_transaction({
-            'from': self.w3.eth.default_account,
+        priority_fee, nonce = await asyncio.gather(
+            self.w3.eth.max_priority_fee,
+            self.w3.eth.get_transaction_count(self.account.address, 'pending')
+        )
+        if self._chain_id is None:
+            self._chain_id = await self.w3.eth.chain_id
+        tx = {
+            'from': self.account.address,
+            'to': self.providers[provider],
+            'data': self.loan_encoders[provider].encode(params),
+            'value': 0,
             'gas': gas_limit,
             'maxFeePerGas': gas_price,
-            'maxPriorityFeePerGas': self.w3.eth.max_priority_fee,
-            'nonce': self.w3.eth.get_transaction_count(self.w3.eth.default_account)
-        })
+            'maxPriorityFeePerGas': priority_fee,
+            'nonce': nonce,
+            'chainId': self._chain_id
+        }
         
-        signed_tx = self.w3.eth.account.sign_transaction(tx, self.w3.eth.account.privateKey)
+        signed_tx = self.account.sign_transaction(tx)
         return await self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
         
     async def _wait_for_confirmation(self, tx_hash: bytes, timeout: int = 180) -> Dict:
@@ -141,7 +187,7 @@ class FlashLoanProvider:
         start_time = asyncio.get_event_loop().time()
         while True:
             try:
-                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+                receipt = await self.w3.eth.get_transaction_receipt(tx_hash)
                 if receipt:
                     return receipt
             except Exception:
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from web3 import Web3
+
+from rpc_provider import RPCEndpointPool
+
+logger = logging.getLogger(__name__)
+
+
+def _selector(signature: str) -> str:
+    return Web3.keccak(text=signature)[:4].hex()
+
+
+BALANCE_OF = _selector('balanceOf(address)')
+AAVE_GET_RESERVE_DATA = _selector('getReserveData(address)')
+AAVE_PREMIUM_TOTAL = _selector('FLASHLOAN_PREMIUM_TOTAL()')
+BALANCER_FEES_COLLECTOR = _selector('getProtocolFeesCollector()')
+BALANCER_FLASH_FEE = _selector('getFlashLoanFeePercentage()')
+
+# Lending entry points per chain (Aave V2 LendingPool / V3 Pool, Balancer Vault,
+# dYdX SoloMargin); dYdX only ever deployed on Ethereum
+FLASH_LOAN_PROVIDERS = {
+    'ethereum': {
+        'aave': '0x7d2768dE32b0b80b7a3454c06BdAc94A69DDc7A9',
+        'balancer': '0xBA12222222228d8Ba445958a75a0704d566BF2C8',
+        'dydx': '0x1E0447b19BB6EcFdAe1e4AE1694b0C3659614e4e'
+    },
+    'arbitrum': {
+        'aave': '0x794a61358D6845594F94dc1DB02A252b5b4814aD',
+        'balancer': '0xBA12222222228d8Ba445958a75a0704d566BF2C8'
+    }
+}
+
+# ReserveData word holding the aTokenAddress (V3 inserted the reserve id before it)
+AAVE_ATOKEN_WORD = {'ethereum': 7, 'arbitrum': 8}
+
+# dYdX charges a flat 2 wei per loan and only lends its listed markets
+DYDX_FLAT_FEE = 2
+DYDX_MARKETS = {
+    'ethereum': {
+        '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2': 0,  # WETH
+        '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48': 2,  # USDC
+        '0x6B175474E89094C44Da98b954EedeAC495271d0F': 3,  # DAI
+    }
+}
+
+
+@dataclass
+class LoanQuote:
+    provider: str
+    liquidity: int
+    fee_bps: float
+    flat_fee: int = 0
+
+    def fee(self, amount: int) -> int:
+        return int(amount * self.fee_bps / 10000) + self.flat_fee
+
+
+def _word(address: str) -> str:
+    return address[2:].lower().rjust(64, '0')
+
+
+class FlashLoanRouter:
+    """Per-block table of flash-loan liquidity and fees across providers.
+
+    ``refresh`` reads every (provider, token) balance in JSON-RPC batches of
+    at most ``batch_size`` calls and rebuilds, per token, the quotes ordered
+    by fee. ``select`` then walks at most one entry per provider, so routing
+    cost does not grow with the number of tracked tokens.
+    """
+
+    def __init__(
+        self,
+        endpoint: RPCEndpointPool,
+        chain: str,
+        tokens: List[str],
+        providers: Optional[Dict[str, str]] = None,
+        batch_size: int = 100
+    ):
+        self.endpoint = endpoint
+        self.batch_size = batch_size  # nodes cap the number of calls per batch
+        self.chain = chain
+        self.providers = providers if providers is not None else FLASH_LOAN_PROVIDERS[chain]
+        self.dydx_markets = DYDX_MARKETS.get(chain, {})
+        self.tokens = [Web3.to_checksum_address(token) for token in tokens]
+        self.table: Dict[str, List[LoanQuote]] = {}
+        self.block_number = 0
+        self._aave_reserves: Dict[str, str] = {}  # token -> aToken holding its liquidity
+        self._aave_checked: Set[str] = set()
+        self._balancer_collector: Optional[str] = None
+        self._running = False
+
+    def track(self, tokens: Iterable[str]):
+        """Add tokens to the table; new Aave reserves are looked up on the next refresh"""
+        known = set(self.tokens)
+        for token in tokens:
+            token = Web3.to_checksum_address(token)
+            if token not in known:
+                self.tokens.append(token)
+                known.add(token)
+
+    def select(self, token: str, amount: int) -> Optional[LoanQuote]:
+        """Cheapest provider with enough liquidity to lend ``amount`` of ``token``"""
+        # Table keys are checksummed; callers may pass lowercase addresses
+        for quote in self.table.get(Web3.to_checksum_address(token), ()):
+            if quote.liquidity >= amount:
+                return quote
+        return None
+
+    def select_many(self, tokens: List[str], amounts: List[int]) -> Optional[LoanQuote]:
+        """Cheapest single provider able to fund every leg of a multi-asset loan"""
+        if len(tokens) == 1:
+            return self.select(tokens[0], amounts[0])
+
+        best: Optional[Tuple[int, LoanQuote]] = None
+        for provider in self.providers:
+            if provider == 'dydx':
+                continue  # SoloMargin loans are single-asset
+            total_fee = 0
+            for token, amount in zip(tokens, amounts):
+                quotes = self.table.get(Web3.to_checksum_address(token), ())
+                quote = next((q for q in quotes if q.provider == provider), None)
+                if quote is None or quote.liquidity < amount:
+                    break
+                total_fee += quote.fee(amount)
+            else:
+                if best is None or total_fee < best[0]:
+                    best = (total_fee, quote)
+        return best[1] if best else None
+
+    async def run(self, poll_interval: float = 0.25):
+        self._running = True
+        while self._running:
+            try:
+                block_number = int(await self.endpoint.request('eth_blockNumber', []), 16)
+                if block_number != self.block_number:
+                    await self.refresh(block_number)
+            except Exception as e:
+                logger.error(f"Flash loan table refresh failed: {e}")
+            await asyncio.sleep(poll_interval)
+
+    def stop(self):
+        self._running = False
+
+    async def refresh(self, block_number: Optional[int] = None):
+        if 'aave' in self.providers and len(self._aave_checked) < len(self.tokens):
+            await self._load_aave_reserves()
+        if 'balancer' in self.providers and self._balancer_collector is None:
+            result = await self.endpoint.request('eth_call', [
+                {'to': self.providers['balancer'], 'data': BALANCER_FEES_COLLECTOR}, 'latest'
+            ])
+            self._balancer_collector = Web3.to_checksum_address('0x' + result[-40:])
+
+        block_tag = hex(block_number) if block_number else 'latest'
+        calls, keys = [], []
+        for token in self.tokens:
+            for provider, holder in self._liquidity_holders(token):
+                calls.append(('eth_call', [{'to': token, 'data': BALANCE_OF + _word(holder)}, block_tag]))
+                keys.append((provider, token))
+
+        fees = {'dydx': 0.0}
+        if 'aave' in self.providers:
+            calls.append(('eth_call', [{'to': self.providers['aave'], 'data': AAVE_PREMIUM_TOTAL}, block_tag]))
+            keys.append(('aave', None))
+        if self._balancer_collector:
+            calls.append(('eth_call', [{'to': self._balancer_collector, 'data': BALANCER_FLASH_FEE}, block_tag]))
+            keys.append(('balancer', None))
+
+        results = await self._batch(calls)
+
+        liquidity: Dict[Tuple[str, str], int] = {}
+        for (provider, token), result in zip(keys, results):
+            value = int(result, 16) if result and result != '0x' else 0
+            if token is None:
+                # Aave premium is in bps; Balancer fee percentage is 1e18-scaled
+                fees[provider] = value if provider == 'aave' else value / 1e14
+            else:
+                liquidity[(provider, token)] = value
+
+        table = {}
+        for token in self.tokens:
+            quotes = [
+                LoanQuote(
+                    provider=provider,
+                    liquidity=liquidity[(provider, token)],
+                    fee_bps=fees.get(provider, 0.0),
+                    flat_fee=DYDX_FLAT_FEE if provider == 'dydx' else 0
+                )
+                for provider, _ in self._liquidity_holders(token)
+                if liquidity.get((provider, token))
+            ]
+            table[token] = sorted(quotes, key=lambda q: (q.fee_bps, q.flat_fee))
+
+        # Swap the whole table at once so select() never sees a half-built block
+        self.table = table
+        if block_number:
+            self.block_number = block_number
+
+    async def _batch(self, calls: List[Tuple[str, List]]) -> List[Any]:
+        chunks = await asyncio.gather(*[
+            self.endpoint.batch(calls[i:i + self.batch_size])
+            for i in range(0, len(calls), self.batch_size)
+        ])
+        return [result for chunk in chunks for result in chunk]
+
+    def _liquidity_holders(self, token: str) -> List[Tuple[str, str]]:
+        holders = []
+        if token in self._aave_reserves:
+            holders.append(('aave', self._aave_reserves[token]))
+        if 'balancer' in self.providers:
+            holders.append(('balancer', self.providers['balancer']))
+        if 'dydx' in self.providers and token in self.dydx_markets:
+            holders.append(('dydx', self.providers['dydx']))
+        return holders
+
+    async def _load_aave_reserves(self):
+        missing = [token for token in self.tokens if token not in self._aave_checked]
+        results = await self._batch([
+            ('eth_call', [{'to': self.providers['aave'], 'data': AAVE_GET_RESERVE_DATA + _word(token)}, 'latest'])
+            for token in missing
+        ])
+        word = AAVE_ATOKEN_WORD.get(self.chain, 7)
+        for token, result in zip(missing, results):
+            if result is None:
+                continue  # Failed call (e.g. rate limited); retried on the next refresh
+            self._aave_checked.add(token)
+            if len(result) < 2 + 64 * (word + 1):
+                continue
+            a_token = '0x' + result[2 + 64 * word:2 + 64 * (word + 1)][-40:]
+            if int(a_token, 16):
+                self._aave_reserves[token] = Web3.to_checksum_address(a_token)
@@ -0,0 +1,121 @@
+"""RPC throughput load test: blocking Web3 vs pooled AsyncWeb3.
+
+Starts a local JSON-RPC stub with a fixed per-request latency and issues the
+same mix of quote/gas reads through both stacks.
+
+    python load_test.py --requests 400 --latency-ms 20
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+
+from aiohttp import web
+from web3 import Web3
+
+from rpc_provider import close_endpoints, get_endpoint
+
+# getAmountsOut(uint256,address[]) returning [amount_in, amount_out]
+AMOUNTS_OUT = '0x' + ''.join(f'{v:064x}' for v in (32, 2, 10 ** 18, 2 * 10 ** 18))
+RESULTS = {
+    'eth_chainId': '0xa4b1',
+    'eth_gasPrice': hex(100_000_000),
+    'eth_call': AMOUNTS_OUT,
+}
+CALL = {'to': '0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506', 'data': '0xd06ca61f'}
+
+
+def start_stub(port: int, latency: float) -> threading.Thread:
+    async def handle(request: web.Request) -> web.Response:
+        body = await request.json()
+        await asyncio.sleep(latency)
+        calls = body if isinstance(body, list) else [body]
+        replies = [
+            {'jsonrpc': '2.0', 'id': c['id'], 'result': RESULTS.get(c['method'], '0x0')}
+            for c in calls
+        ]
+        return web.json_response(replies if isinstance(body, list) else replies[0])
+
+    def serve():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_post('/', handle)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, '127.0.0.1', port).start())
+        loop.run_forever()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    time.sleep(0.5)
+    return thread
+
+
+def run_blocking(url: str, n: int) -> float:
+    w3 = Web3(Web3.HTTPProvider(url))
+    start = time.perf_counter()
+    for i in range(n):
+        if i % 2:
+            w3.eth.gas_price
+        else:
+            w3.eth.call(CALL)
+    return n / (time.perf_counter() - start)
+
+
+async def run_async(url: str, n: int) -> float:
+    w3 = get_endpoint(url).web3()
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        w3.eth.gas_price if i % 2 else w3.eth.call(CALL)
+        for i in range(n)
+    ])
+    elapsed = time.perf_counter() - start
+    await close_endpoints()
+    return n / elapsed
+
+
+async def run_batched(url: str, n: int, batch_size: int) -> float:
+    endpoint = get_endpoint(url)
+    calls = [
+        ('eth_gasPrice', []) if i % 2 else ('eth_call', [CALL, 'latest'])
+        for i in range(n)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        endpoint.batch(calls[i:i + batch_size])
+        for i in range(0, n, batch_size)
+    ])
+    elapsed = time.perf_counter() - start
+    await close_endpoints()
+    return n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--port', type=int, default=8547)
+    args = parser.parse_args()
+
+    url = f'http://127.0.0.1:{args.port}/'
+    start_stub(args.port, args.latency_ms / 1000)
+
+    blocking = run_blocking(url, args.requests)
+    pooled = asyncio.run(run_async(url, args.requests))
+    batched = asyncio.run(run_batched(url, args.requests, args.batch_size))
+
+    print(json.dumps({
+        'requests': args.requests,
+        'latency_ms': args.latency_ms,
+        'blocking_rps': round(blocking, 1),
+        'async_pooled_rps': round(pooled, 1),
+        'async_batched_rps': round(batched, 1),
+        'speedup': round(pooled / blocking, 1)
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,28 @@
 import asyncio
 import logging
-from web3 import Web3
 from eth_account import Account
+from web3 import Web3
 from config import (
     NETWORK, RPC_URLS, PRIVATE_KEY, 
     SUSHI_ROUTER, CAMELOT_ROUTER,
-    CIRCUIT_BREAKER
+    POOL_DB_PATH, POOL_FACTORIES,
+    POOL_INDEX_INTERVAL, POOL_RESERVE_INTERVAL, FLASH_LOAN_CONTRACT,
+    PROFILER_ADMIN_PORT, MAX_QUOTED_PAIRS, MEMPOOL_PAIR_TTL
 )
 from dex_interface import DEXInterface
 from arbitrage_finder import ArbitrageFinder
+from chain_supervisor import build_supervisor
+from bundle_builder import REQUEST_FLASH_LOAN, SWAP_KINDS, Bundle, BundleBuilder, Opportunity, SwapLeg
+from flash_loan_router import FLASH_LOAN_PROVIDERS, FlashLoanRouter
+from pool_indexer import PoolIndexer, PoolStore
+from profiler import start_admin_server, start_profiler
+from rpc_provider import get_endpoint, close_endpoints
+from runtime_config import RuntimeConfig, StrategyConfig
 import json
 import signal
 import sys
+import time
+from typing import Dict, Tuple
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,19 +32,56 @@ logger = logging.getLogger(__name__)
 
 class ArbitrumMEVBot:
     def __init__(self):
-        self.w3 = Web3(Web3.HTTPProvider(RPC_URLS[NETWORK]))
+        self.endpoint = get_endpoint(RPC_URLS[NETWORK])
+        self.w3 = self.endpoint.web3()
         self.account = Account.from_key(PRIVATE_KEY)
+        # An empty or malformed `to` would turn every bundle into a contract creation
+        if not Web3.is_checksum_address(FLASH_LOAN_CONTRACT):
+            raise ValueError(
+                f"FLASH_LOAN_CONTRACT must be the checksummed address of the deployed "
+                f"FlashLoanArbitrage, got {FLASH_LOAN_CONTRACT!r}"
+            )
         
         # Initialize DEX interfaces
         self.dexes = [
-            DEXInterface(self.w3, SUSHI_ROUTER, self._load_abi('sushiswap')),
-            DEXInterface(self.w3, CAMELOT_ROUTER, self._load_abi('camelot'))
+            DEXInterface(self.w3, SUSHI_ROUTER, self._load_abi('sushiswap'), 'sushiswap'),
+            DEXInterface(self.w3, CAMELOT_ROUTER, self._load_abi('camelot'), 'camelot')
         ]
         
-        self.finder = ArbitrageFinder(self.dexes)
+        self.finder = ArbitrageFinder(self.dexes, NETWORK)
+        self.indexer = PoolIndexer(
+            PoolStore(POOL_DB_PATH),
+            RPC_URLS[NETWORK],
+            NETWORK,
+            POOL_FACTORIES.get(NETWORK, [])
+        )
+        self.bundler = BundleBuilder()
+        # Liquidity/fee table of the lenders on this chain, rebuilt once per block
+        self.loan_router = FlashLoanRouter(
+            self.endpoint,
+            NETWORK,
+            [],
+            {name: address for name, address in FLASH_LOAN_PROVIDERS[NETWORK].items() if name in REQUEST_FLASH_LOAN}
+        )
+        # Mempool shards report pending swaps; the pairs they touch are quoted until they expire
+        self.supervisor = build_supervisor(self.on_pending_swap)
+        self.hot_pairs: Dict[Tuple[str, str], float] = {}
+        self.nonce = None
+        self.chain_id = None
         self.total_profit = 0
         self.running = False
         
+        # Strategy/risk values are pushed into live components on every reload
+        self.runtime_config = RuntimeConfig()
+        self.runtime_config.load()
+        for component in (self, self.finder, self.bundler):
+            self.runtime_config.subscribe(component.apply_config)
+        
+    def apply_config(self, config: StrategyConfig):
+        self.circuit_breaker = config.circuit_breaker
+        self.execution_timeout = config.execution_timeout
+        self.poll_interval = config.poll_interval
+        
     def _load_abi(self, name: str) -> str:
         with open(f'abis/{name}.json') as f:
             return json.load(f)
@@ -42,54 +90,193 @@ class ArbitrumMEVBot:
         self.running = True
         logger.info(f"Starting MEV bot on {NETWORK}")
         
-        # Setup signal handlers
+        # Warm start from the on-disk snapshot, then catch up in the background
+        self.indexer.load_snapshot()
+        indexer_task = asyncio.create_task(self.indexer.run(POOL_INDEX_INTERVAL, POOL_RESERVE_INTERVAL))
+        config_task = asyncio.create_task(self.runtime_config.watch())
+        supervisor_task = asyncio.create_task(self.supervisor.start()) if self.supervisor else None
+        
+        # Always-on sampling profiler; SIGUSR2 writes a collapsed-stack file
+        profiler = start_profiler()
+        admin = None
+        if profiler and PROFILER_ADMIN_PORT:
+            admin = await start_admin_server(profiler, port=PROFILER_ADMIN_PORT)
+        
+        # Setup signal handlers (SIGHUP reloads the runtime config)
         for sig in (signal.SIGTERM, signal.SIGINT):
             asyncio.get_event_loop().add_signal_handler(sig, self.stop)
+        self.runtime_config.install_signal_handler()
             
         try:
             while self.running:
-                if self.total_profit < CIRCUIT_BREAKER:
+                if self.total_profit < self.circuit_breaker:
                     logger.warning("Circuit breaker triggered! Stopping bot...")
                     self.stop()
                     break
                     
                 # Monitor for opportunities
                 await self._check_opportunities()
-                await asyncio.sleep(0.1)  # Rate limiting
+                await asyncio.sleep(self.poll_interval)  # Rate limiting
                 
         except Exception as e:
             logger.error(f"Fatal error: {e}")
             self.stop()
+        finally:
+            self.indexer.stop()
+            self.runtime_config.stop()
+            indexer_task.cancel()
+            config_task.cancel()
+            if supervisor_task:
+                # Stops and joins the shard processes
+                supervisor_task.cancel()
+                await asyncio.gather(supervisor_task, return_exceptions=True)
+            if profiler:
+                profiler.stop()
+            if admin:
+                await admin.cleanup()
+            await close_endpoints()
             
+    async def on_pending_swap(self, tx_data: Dict):
+        """Supervisor callback: quote the pairs a pending swap on our chain is about to move"""
+        if tx_data['chain'].value != NETWORK:
+            return
+        path = tx_data['swap']['path']
+        expires = time.monotonic() + MEMPOOL_PAIR_TTL
+        for token_a, token_b in zip(path, path[1:]):
+            pools = [self.indexer.find_pool(dex.name, token_a, token_b) for dex in self.dexes]
+            if all(pools):
+                self.hot_pairs[(pools[0].token0, pools[0].token1)] = expires
+        
     async def _check_opportunities(self):
-        # Example token pairs to monitor
-        token_pairs = [
-            # USDC/USDT pair
-            ('0xFF970A61A04b1cA14834A43f5dE4533eBDDB5CC8', 
-             '0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9'),
-            # WETH/USDC pair
-            ('0x82aF49447D8a07e3bd95BD0d56f35241523fBab1',
-             '0xFF970A61A04b1cA14834A43f5dE4533eBDDB5CC8')
-        ]
+        # Screen every shared pair on the indexer's stored reserves, quote only the best on-chain
+        token_pairs = self.indexer.screen_pairs(('sushiswap', 'camelot'), self._trade_amount, MAX_QUOTED_PAIRS)
+        # Pairs a pending swap is moving are quoted regardless of the screen
+        now = time.monotonic()
+        self.hot_pairs = {pair: expires for pair, expires in self.hot_pairs.items() if expires > now}
+        token_pairs += [pair for pair in self.hot_pairs if pair not in token_pairs]
         
-        for pair in token_pairs:
-            opportunity = await self.finder.find_opportunity(
-                pair,
-                Web3.to_wei(10, 'ether')  # Example amount
-            )
+        # Quote the candidates concurrently over the shared connection pool
+        block_number, *opportunities = await asyncio.gather(
+            self.w3.eth.block_number,
+            *[
+                self.finder.find_opportunity(pair, self._trade_amount(pair))
+                for pair in token_pairs
+            ]
+        )
+        
+        # Polls only collect; the window is bundled once window_blocks blocks were mined past its start
+        bundles = self.bundler.flush(block_number) if self.bundler.due(block_number) else []
             
+        for opportunity in opportunities:
             if opportunity:
-                await self._execute_arbitrage(opportunity)
+                self._queue_arbitrage(opportunity, block_number)
+                
+        if not bundles:
+            return
+            
+        if block_number != self.loan_router.block_number:
+            self.loan_router.track({bundle.loan_token for bundle in bundles})
+            try:
+                await self.loan_router.refresh(block_number)
+            except Exception as e:
+                logger.error(f"Flash loan table refresh failed: {e}")
+                
+        # Land everything found in the window as few, non-conflicting transactions
+        for bundle in bundles:
+            try:
+                await asyncio.wait_for(self._execute_bundle(bundle), self.execution_timeout)
+            except asyncio.TimeoutError:
+                self.nonce = None
+                logger.error("Bundle execution timed out")
+                
+    def _trade_amount(self, pair: tuple) -> int:
+        token = self.indexer.tokens.get(pair[0])
+        decimals = token.decimals if token else 18
+        return 10 * 10 ** decimals  # Example amount
                 
-    async def _execute_arbitrage(self, opportunity: dict):
+    def _queue_arbitrage(self, opportunity: dict, block_number: int):
+        token_in, token_out = opportunity['token_pair']
+        # Swap out on the venue paying the most, then back on the other one
+        first, second = opportunity['sell_dex'], opportunity['buy_dex']
+        venues = (
+            self.indexer.find_pool(first.name, token_in, token_out),
+            self.indexer.find_pool(second.name, token_in, token_out)
+        )
+        if not all(venues):
+            # Conflict checks need both pools; an unindexed venue cannot be packed safely
+            return
+        pools = frozenset(pool.address for pool in venues)
+        self.bundler.add(Opportunity(
+            legs=[
+                SwapLeg(
+                    first.router.address, token_in, token_out, opportunity['amount_in'], opportunity['min_out'],
+                    SWAP_KINDS[first.name]
+                ),
+                SwapLeg(
+                    second.router.address, token_out, token_in, 0, opportunity['amount_in'],
+                    SWAP_KINDS[second.name]
+                )
+            ],
+            loan_token=token_in,
+            loan_amount=opportunity['amount_in'],
+            profit=opportunity['profit'],
+            value=opportunity['profit_usd'],
+            reads=pools,
+            writes=pools,
+            block_number=block_number
+        ))
+        
+    async def _execute_bundle(self, bundle: Bundle):
+        # Borrow from the cheapest lender that can fund the bundle this block
+        quote = self.loan_router.select(bundle.loan_token, bundle.loan_amount)
+        if quote is None:
+            logger.warning(f"No flash loan liquidity for {bundle.loan_amount} of {bundle.loan_token}")
+            return
+        fee = quote.fee(bundle.loan_amount)
+        if fee >= bundle.profit:
+            logger.info(f"Skipping bundle: {quote.provider} fee {fee} exceeds profit {bundle.profit}")
+            return
+            
         try:
-            # Implementation of arbitrage execution
-            logger.info(f"Executing arbitrage with potential profit: ${opportunity['profit_usd']:.2f}")
-            # Add your execution logic here
-            pass
+            logger.info(
+                f"Executing bundle of {len(bundle.opportunities)} arbitrages "
+                f"({len(bundle.legs)} swaps) borrowing {bundle.loan_amount} of {bundle.loan_token} "
+                f"from {quote.provider}"
+            )
+            if self.nonce is None:
+                self.nonce, self.chain_id = await asyncio.gather(
+                    self.w3.eth.get_transaction_count(self.account.address, 'pending'),
+                    self.w3.eth.chain_id
+                )
+            gas_price, priority_fee = await asyncio.gather(
+                self.w3.eth.gas_price,
+                self.w3.eth.max_priority_fee
+            )
+            tx = {
+                'from': self.account.address,
+                'to': FLASH_LOAN_CONTRACT,
+                'data': bundle.encode_call(quote.provider),
+                'value': 0,
+                'maxFeePerGas': gas_price + priority_fee,
+                'maxPriorityFeePerGas': priority_fee,
+                'nonce': self.nonce,
+                'chainId': self.chain_id
+            }
+            # Simulate first: a bundle that would revert is dropped instead of paying for gas
+            try:
+                gas = await self.w3.eth.estimate_gas(tx)
+            except Exception as e:
+                logger.warning(f"Skipping bundle, simulation reverted: {e}")
+                return
+            tx['gas'] = int(gas * 1.1)  # Add 10% safety margin
+            signed_tx = self.account.sign_transaction(tx)
+            await self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            self.nonce += 1
             
         except Exception as e:
-            logger.error(f"Arbitrage execution failed: {e}")
+            # Resync the nonce from the node on the next bundle
+            self.nonce = None
+            logger.error(f"Bundle execution failed: {e}")
             
     def stop(self):
         logger.info("Shutting down MEV bot...")
@@ -1,13 +1,17 @@
-from web3 import Web3
 import asyncio
 import logging
-from typing import Dict, Set, List, Callable
+from typing import Dict, Set, List, Callable, Optional
 import json
 import time
 from concurrent.futures import ThreadPoolExecutor
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from enum import Enum
+import aiohttp
+from eth_abi import decode
+from web3 import Web3
+from codec import FRAME_ERRORS, FrameDecoder
+from rpc_provider import get_endpoint
 
 logger = logging.getLogger(__name__)
 
@@ -26,23 +30,49 @@ class MempoolConfig:
     ws_urls: List[str]
     min_profit: float
     max_gas: int
+    min_swap_value: float = 0.0  # native units; smaller swaps rarely move a pool enough to backrun
+    routers: List[str] = field(default_factory=list)  # empty accepts any V2-style router
+
+# UniswapV2Router02 swaps: signature -> (amount_in arg, amount_out arg); None is msg.value
+V2_SWAPS = {
+    'swapExactTokensForTokens(uint256,uint256,address[],address,uint256)': (0, 1),
+    'swapTokensForExactTokens(uint256,uint256,address[],address,uint256)': (1, 0),
+    'swapExactETHForTokens(uint256,address[],address,uint256)': (None, 0),
+    'swapETHForExactTokens(uint256,address[],address,uint256)': (None, 0),
+    'swapExactTokensForETH(uint256,uint256,address[],address,uint256)': (0, 1),
+    'swapTokensForExactETH(uint256,uint256,address[],address,uint256)': (1, 0),
+}
+SWAP_DECODERS = {
+    Web3.keccak(text=signature)[:4].hex(): (
+        signature.split('(')[0],
+        signature[signature.index('(') + 1:-1].split(','),
+        amounts
+    )
+    for signature, amounts in V2_SWAPS.items()
+}
 
 class EnhancedMempoolMonitor:
     def __init__(self, configs: List[MempoolConfig], callback: Callable):
         self.configs = configs
         self.callback = callback
+        self.chain_configs = {config.chain: config for config in configs}
+        # Only allocate pools for the chains this monitor runs (one per shard process)
         self.executors = {
-            chain: ThreadPoolExecutor(max_workers=8)
-            for chain in Chain
+            chain: ThreadPoolExecutor(max_workers=8, thread_name_prefix=f'mempool-{chain.value}')
+            for chain in self.chain_configs
         }
         self.transaction_cache = {
             chain: deque(maxlen=10000)
-            for chain in Chain
+            for chain in self.chain_configs
         }
-        self.web3_instances = {}
         self.ws_connections = {}
+        self._ws_session: Optional[aiohttp.ClientSession] = None
         self._running = False
         self.opportunity_queue = asyncio.Queue()
+        self.frame_decoder = FrameDecoder('pending_tx')
+        self.base_configs = dict(self.chain_configs)
+        self.processor_count = 4
+        self._processor_tasks: Dict[int, asyncio.Task] = {}
         
     async def start(self):
         self._running = True
@@ -53,49 +83,88 @@ class EnhancedMempoolMonitor:
                 for config in self.configs
             ]
             
-            # Start opportunity processor
-            processors = [
-                self._process_opportunities()
-                for _ in range(4)  # 4 parallel processors
-            ]
+            # Start opportunity processors (resized live by apply_config)
+            self._resize_processors()
             
-            await asyncio.gather(
-                *monitors,
-                *processors
-            )
+            await asyncio.gather(*monitors)
             
         except Exception as e:
             logger.error(f"Mempool monitoring error: {e}")
             self.stop()
+        finally:
+            for task in self._processor_tasks.values():
+                task.cancel()
+            self._processor_tasks.clear()
 
     async def _monitor_chain(self, config: MempoolConfig):
-        while self._running:
-            try:
-                # Websocket monitoring for pending transactions
-                ws = await self._setup_ws_connection(config)
-                await self._subscribe_to_mempool(ws, config.chain)
-                
-                # REST API fallback
-                rest_task = asyncio.create_task(
-                    self._poll_pending_transactions(config)
-                )
-                
-                while self._running:
-                    msg = await ws.recv()
-                    await self._handle_transaction(msg, config)
-                    
-            except Exception as e:
-                logger.error(f"Chain monitoring error for {config.chain}: {e}")
-                await asyncio.sleep(1)
+        if not config.ws_urls:
+            await self._poll_pending_transactions(config)
+            return
+
+        rest_task = None
+        attempt = 0
+        try:
+            while self._running:
+                try:
+                    # Websocket monitoring for pending transactions
+                    ws = await self._setup_ws_connection(config, attempt)
+                    await self._subscribe_to_mempool(ws, config.chain)
+                    if rest_task is not None:
+                        rest_task.cancel()
+                        rest_task = None
+                    attempt = 0
+
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        await self._handle_transaction(msg.data, config)
+                    logger.warning(f"Websocket closed for {config.chain}")
+
+                except Exception as e:
+                    logger.error(f"Chain monitoring error for {config.chain}: {e}")
+
+                # REST API fallback until the websocket is back
+                if rest_task is None:
+                    rest_task = asyncio.create_task(self._poll_pending_transactions(config))
+                attempt += 1
+                await asyncio.sleep(min(2 ** attempt, 30))
+        finally:
+            if rest_task is not None:
+                rest_task.cancel()
+
+    def apply_config(self, config):
+        """Apply a runtime StrategyConfig without touching connections or caches"""
+        for chain, base in self.base_configs.items():
+            self.chain_configs[chain] = replace(
+                base,
+                max_gas=config.max_gas.get(chain.value, base.max_gas)
+            )
+
+        self.processor_count = config.mempool_processors
+        if self._running:
+            self._resize_processors()
+
+    def _resize_processors(self):
+        """Keep exactly one processor task per slot below processor_count"""
+        for slot in range(self.processor_count):
+            task = self._processor_tasks.get(slot)
+            if task is None or task.done():
+                self._processor_tasks[slot] = asyncio.create_task(self._process_opportunities())
+        for slot in [slot for slot in self._processor_tasks if slot >= self.processor_count]:
+            # Idle surplus processors sit in queue.get(); in-flight analysis is shielded
+            self._processor_tasks.pop(slot).cancel()
 
     async def _process_opportunities(self):
         while self._running:
+            opportunity = await self.opportunity_queue.get()
             try:
-                opportunity = await self.opportunity_queue.get()
-                await self._analyze_and_execute(opportunity)
-                self.opportunity_queue.task_done()
+                await asyncio.shield(self._analyze_and_execute(opportunity))
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Opportunity processing error: {e}")
+            finally:
+                self.opportunity_queue.task_done()
 
     async def _analyze_and_execute(self, tx_data: Dict):
         try:
@@ -103,8 +172,17 @@ class EnhancedMempoolMonitor:
             if not self._is_profitable_opportunity(tx_data):
                 return
 
-            # Detailed analysis in thread pool
             chain = tx_data['chain']
+            if tx_data.get('input') is None:
+                # Hash-only notification; fetch the body once it passed dedupe
+                tx_data = await self._fetch_transaction(tx_data)
+                if tx_data is None:
+                    return
+                gas_price = tx_data.get('gasPrice') or tx_data.get('maxFeePerGas') or 0
+                if gas_price > self.chain_configs[chain].max_gas:
+                    return
+
+            # Detailed analysis in thread pool
             executor = self.executors[chain]
             is_profitable = await asyncio.get_event_loop().run_in_executor(
                 executor,
@@ -118,6 +196,61 @@ class EnhancedMempoolMonitor:
         except Exception as e:
             logger.error(f"Analysis error: {e}")
 
+    async def _fetch_transaction(self, tx_data: Dict) -> Optional[Dict]:
+        chain = tx_data['chain']
+        endpoint = get_endpoint(self.chain_configs[chain].rpc_urls[0])
+        raw = await endpoint.request('eth_getTransactionByHash', [tx_data['hash']])
+        if raw is None:
+            return None  # Already dropped or replaced
+        full = self.frame_decoder.from_dict(raw)
+        full['chain'] = chain
+        return full
+
+    def _detailed_analysis(self, tx_data: Dict) -> bool:
+        """Decode a V2 router swap and keep it if it is large enough to backrun.
+
+        Runs in the chain's thread pool. On success the decoded swap is
+        attached as ``tx_data['swap']`` for the callback. Token-to-token
+        swaps have no native-denominated size here and are always passed on;
+        the coordinator prices them against pool reserves.
+        """
+        config = self.chain_configs[tx_data['chain']]
+        to, data = tx_data.get('to'), tx_data.get('input') or ''
+        if not to or len(data) < 10:
+            return False
+        if config.routers and to.lower() not in {router.lower() for router in config.routers}:
+            return False
+
+        swap = SWAP_DECODERS.get(data[:10])
+        if swap is None:
+            return False
+        method, types, (in_arg, out_arg) = swap
+        try:
+            args = decode(types, bytes.fromhex(data[10:]))
+        except Exception:
+            return False  # Malformed calldata
+
+        path = args[types.index('address[]')]
+        if len(path) < 2:
+            return False
+        amount_in = (tx_data.get('value') or 0) if in_arg is None else args[in_arg]
+        amount_out = args[out_arg]
+
+        # Only swaps paying in or out the native token have a native size to gate on
+        if 'ETH' in method:
+            native = amount_in if in_arg is None else amount_out
+            if native < config.min_swap_value * 10 ** 18:
+                return False
+
+        tx_data['swap'] = {
+            'method': method,
+            'router': to,
+            'path': [Web3.to_checksum_address(token) for token in path],
+            'amount_in': amount_in,
+            'amount_out': amount_out
+        }
+        return True
+
     def _is_profitable_opportunity(self, tx_data: Dict) -> bool:
         # Quick memory-based checks
         try:
@@ -129,10 +262,10 @@ class EnhancedMempoolMonitor:
                 return False
 
             # Basic profitability check
-            gas_price = int(tx_data.get('gasPrice', 0))
-            value = int(tx_data.get('value', 0))
+            gas_price = tx_data.get('gasPrice') or tx_data.get('maxFeePerGas') or 0
+            value = tx_data.get('value') or 0
             
-            if gas_price > self.configs[chain].max_gas:
+            if gas_price > self.chain_configs[chain].max_gas:
                 return False
 
             # Add to cache
@@ -142,40 +275,62 @@ class EnhancedMempoolMonitor:
         except Exception:
             return False
 
-    async def _setup_ws_connection(self, config: MempoolConfig):
-        # Implement WebSocket connection with auto-reconnect
-        pass
+    async def _handle_transaction(self, msg, config: MempoolConfig):
+        try:
+            if isinstance(msg, (str, bytes)):
+                tx_data = self.frame_decoder.decode(msg)
+                if tx_data is None:
+                    return  # Subscription ack or other non-notification frame
+            else:
+                tx_data = self.frame_decoder.from_dict(msg)
+        except FRAME_ERRORS as e:
+            # One odd frame must not tear down the websocket and its subscription
+            logger.debug(f"Skipping undecodable transaction on {config.chain}: {e}")
+            return
+        tx_data['chain'] = config.chain
+        await self.opportunity_queue.put(tx_data)
+
+    async def _setup_ws_connection(self, config: MempoolConfig, attempt: int = 0) -> aiohttp.ClientWebSocketResponse:
+        # Rotate through the configured URLs on successive reconnects
+        if self._ws_session is None or self._ws_session.closed:
+            self._ws_session = aiohttp.ClientSession()
+        url = config.ws_urls[attempt % len(config.ws_urls)]
+        ws = await self._ws_session.ws_connect(url, heartbeat=30, max_msg_size=0)
+        self.ws_connections[config.chain] = ws
+        logger.info(f"Connected mempool websocket for {config.chain}: {url}")
+        return ws
 
     async def _subscribe_to_mempool(self, ws, chain: Chain):
-        # Subscribe to pending transactions
+        # Subscribe to pending transactions; Geth-style nodes send full bodies
+        # with the flag, others ignore it and send hashes
         subscription = {
             "jsonrpc": "2.0",
             "id": 1,
             "method": "eth_subscribe",
-            "params": ["newPendingTransactions"]
+            "params": ["newPendingTransactions", True]
         }
-        await ws.send(json.dumps(subscription))
+        await ws.send_str(json.dumps(subscription))
 
     async def _poll_pending_transactions(self, config: MempoolConfig):
         # Fallback REST API polling
         while self._running:
             try:
-                web3 = self._get_web3(config)
-                txs = await web3.eth.get_pending_transactions()
-                for tx in txs:
+                endpoint = get_endpoint(config.rpc_urls[0])
+                for tx in await endpoint.pending_transactions():
                     await self._handle_transaction(tx, config)
             except Exception as e:
                 logger.error(f"Polling error for {config.chain}: {e}")
             await asyncio.sleep(0.1)  # 100ms polling interval
 
-    def _get_web3(self, config: MempoolConfig) -> Web3:
-        if config.chain not in self.web3_instances:
-            self.web3_instances[config.chain] = Web3(
-                Web3.WebsocketProvider(config.ws_urls[0])
-            )
-        return self.web3_instances[config.chain]
-
     def stop(self):
         self._running = False
         for executor in self.executors.values():
-            executor.shutdown(wait=False)
\ No newline at end of file
+            executor.shutdown(wait=False)
+
+    async def close(self):
+        self.stop()
+        for ws in self.ws_connections.values():
+            await ws.close()
+        self.ws_connections.clear()
+        if self._ws_session is not None:
+            await self._ws_session.close()
\ No newline at end of file
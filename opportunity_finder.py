@@ -9,7 +9,7 @@ logger = logging.getLogger(__name__)
 class OpportunityFinder:
     def __init__(self, rpc_client):
         self.client = rpc_client
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='opportunity')
         self.min_profit = Decimal('0.01')  # In SOL
         
     async def analyze_transaction(self, tx_data: Dict) -> Optional[Dict]:
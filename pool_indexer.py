@@ -0,0 +1,610 @@
+import asyncio
+import base64
+import hashlib
+import logging
+import os
+import sqlite3
+import struct
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import base58
+from web3 import Web3
+
+from rpc_provider import RPCError, get_endpoint
+
+logger = logging.getLogger(__name__)
+
+# Factory events (token0 and token1 are always indexed topics)
+PAIR_CREATED_TOPIC = Web3.keccak(text='PairCreated(address,address,address,uint256)').hex()
+POOL_CREATED_TOPIC = Web3.keccak(text='PoolCreated(address,address,uint24,int24,address)').hex()
+
+# ERC20 / pair selectors used for metadata and reserve reads
+DECIMALS_SELECTOR = '0x313ce567'
+SYMBOL_SELECTOR = '0x95d89b41'
+GET_RESERVES_SELECTOR = '0x0902f1ac'
+
+DEFAULT_V2_FEE_BPS = 30
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS tokens (
+    chain TEXT NOT NULL,
+    address TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    decimals INTEGER NOT NULL,
+    PRIMARY KEY (chain, address)
+);
+CREATE TABLE IF NOT EXISTS pools (
+    chain TEXT NOT NULL,
+    address TEXT NOT NULL,
+    dex TEXT NOT NULL,
+    token0 TEXT NOT NULL,
+    token1 TEXT NOT NULL,
+    fee_bps REAL NOT NULL,
+    reserve0 TEXT NOT NULL DEFAULT '0',
+    reserve1 TEXT NOT NULL DEFAULT '0',
+    updated_block INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (chain, address)
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    chain TEXT NOT NULL,
+    source TEXT NOT NULL,
+    last_block INTEGER NOT NULL,
+    PRIMARY KEY (chain, source)
+);
+'''
+
+
+@dataclass
+class TokenInfo:
+    address: str
+    symbol: str
+    decimals: int
+
+
+@dataclass
+class PoolInfo:
+    address: str
+    dex: str
+    token0: str
+    token1: str
+    fee_bps: float
+    reserve0: int = 0
+    reserve1: int = 0
+    updated_block: int = 0
+
+
+def v2_amount_out(pool: PoolInfo, token_in: str, amount_in: int) -> int:
+    """Constant-product output of a V2-style pool from its stored reserves"""
+    if token_in == pool.token0:
+        reserve_in, reserve_out = pool.reserve0, pool.reserve1
+    else:
+        reserve_in, reserve_out = pool.reserve1, pool.reserve0
+    if not reserve_in or not reserve_out:
+        return 0
+    amount_in_with_fee = int(amount_in * (10000 - pool.fee_bps))
+    return amount_in_with_fee * reserve_out // (reserve_in * 10000 + amount_in_with_fee)
+
+
+class PoolStore:
+    """SQLite snapshot of the discovered pool universe"""
+
+    def __init__(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def load(self, chain: str) -> Tuple[Dict[str, TokenInfo], Dict[str, PoolInfo], Dict[str, int]]:
+        tokens = {
+            address: TokenInfo(address, symbol, decimals)
+            for address, symbol, decimals in self.conn.execute(
+                'SELECT address, symbol, decimals FROM tokens WHERE chain = ?', (chain,)
+            )
+        }
+        pools = {
+            row[0]: PoolInfo(row[0], row[1], row[2], row[3], row[4], int(row[5]), int(row[6]), row[7])
+            for row in self.conn.execute(
+                'SELECT address, dex, token0, token1, fee_bps, reserve0, reserve1, updated_block '
+                'FROM pools WHERE chain = ?', (chain,)
+            )
+        }
+        cursors = dict(self.conn.execute(
+            'SELECT source, last_block FROM cursors WHERE chain = ?', (chain,)
+        ))
+        return tokens, pools, cursors
+
+    def save_pools(self, chain: str, pools: Iterable[PoolInfo]):
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO pools VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (chain, p.address, p.dex, p.token0, p.token1, p.fee_bps,
+                     str(p.reserve0), str(p.reserve1), p.updated_block)
+                    for p in pools
+                ]
+            )
+
+    def save_tokens(self, chain: str, tokens: Iterable[TokenInfo]):
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO tokens VALUES (?, ?, ?, ?)',
+                [(chain, t.address, t.symbol, t.decimals) for t in tokens]
+            )
+
+    def set_cursor(self, chain: str, source: str, block: int):
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO cursors VALUES (?, ?, ?)', (chain, source, block)
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+class PoolIndexer:
+    """Discovers EVM pools from factory logs and keeps them in a PoolStore.
+
+    Startup loads the last snapshot from disk; ``catch_up`` then scans only
+    the blocks mined since the stored cursor of each factory.
+    """
+
+    def __init__(
+        self,
+        store: PoolStore,
+        rpc_url: str,
+        chain: str,
+        factories: List[Dict],
+        block_span: int = 2000,
+        max_concurrency: int = 8
+    ):
+        self.store = store
+        self.endpoint = get_endpoint(rpc_url)
+        self.chain = chain
+        self.factories = factories
+        self.block_span = block_span
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.tokens: Dict[str, TokenInfo] = {}
+        self.pools: Dict[str, PoolInfo] = {}
+        self.cursors: Dict[str, int] = {}
+        self._by_venue: Dict[Tuple[str, str, str], PoolInfo] = {}
+        self._running = False
+
+    def load_snapshot(self) -> int:
+        start = time.perf_counter()
+        self.tokens, self.pools, self.cursors = self.store.load(self.chain)
+        self._by_venue = {(p.dex, p.token0, p.token1): p for p in self.pools.values()}
+        logger.info(
+            f"Loaded {len(self.pools)} pools and {len(self.tokens)} tokens for {self.chain} "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return len(self.pools)
+
+    def shared_pairs(self, min_venues: int = 2, dexes: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+        """Token pairs listed on at least ``min_venues`` of the given DEXes"""
+        allowed = set(dexes) if dexes else None
+        venues: Dict[Tuple[str, str], set] = {}
+        for pool in self.pools.values():
+            if allowed is not None and pool.dex not in allowed:
+                continue
+            venues.setdefault((pool.token0, pool.token1), set()).add(pool.dex)
+        return [pair for pair, dexes in venues.items() if len(dexes) >= min_venues]
+
+    def find_pool(self, dex: str, token_a: str, token_b: str) -> Optional[PoolInfo]:
+        return self._by_venue.get((dex, token_a, token_b)) or self._by_venue.get((dex, token_b, token_a))
+
+    def screen_pairs(
+        self,
+        dexes: Tuple[str, ...],
+        amount_for: Callable[[Tuple[str, str]], int],
+        limit: int
+    ) -> List[Tuple[str, str]]:
+        """Shared pairs whose stored reserves show a round-trip gain, best first.
+
+        Sells ``amount_for(pair)`` of the pair's first token on one DEX and buys
+        it back on another, using the constant-product formula with each
+        pool's fee. Only the top ``limit`` pairs are returned, so callers can
+        confirm them with on-chain quotes without an RPC call per pair.
+        """
+        candidates = []
+        for pair in self.shared_pairs(dexes=dexes):
+            pools = [
+                pool for pool in (self.find_pool(dex, *pair) for dex in dexes)
+                if pool and pool.reserve0 and pool.reserve1
+            ]
+            amount = amount_for(pair)
+            best = 0
+            for sell in pools:
+                out = v2_amount_out(sell, pair[0], amount)
+                for buy in pools:
+                    if buy is not sell:
+                        best = max(best, v2_amount_out(buy, pair[1], out) - amount)
+            if best > 0:
+                candidates.append((best / amount, pair))
+        candidates.sort(reverse=True)
+        return [pair for _, pair in candidates[:limit]]
+
+    def tradable_pools(self, min_venues: int = 2) -> List[PoolInfo]:
+        """V2-style pools whose pair is listed on at least ``min_venues`` DEXes"""
+        v2_dexes = {f['name'] for f in self.factories if f['kind'] == 'v2'}
+        pairs = set(self.shared_pairs(min_venues, v2_dexes))
+        return [
+            pool for pool in self.pools.values()
+            if pool.dex in v2_dexes and (pool.token0, pool.token1) in pairs
+        ]
+
+    async def run(self, interval: float = 15, reserve_interval: float = 60):
+        self._running = True
+        last_refresh = 0.0
+        while self._running:
+            try:
+                await self.catch_up()
+                # Stored reserves go stale as pairs trade; keep the ones we quote fresh
+                if time.monotonic() - last_refresh >= reserve_interval:
+                    latest = int(await self.endpoint.request('eth_blockNumber', []), 16)
+                    await self.refresh_reserves(self.tradable_pools(), latest)
+                    last_refresh = time.monotonic()
+            except Exception as e:
+                logger.error(f"Pool indexing error for {self.chain}: {e}")
+            await asyncio.sleep(interval)
+
+    def stop(self):
+        self._running = False
+
+    async def catch_up(self) -> int:
+        latest = int(await self.endpoint.request('eth_blockNumber', []), 16)
+        discovered: List[PoolInfo] = []
+
+        for factory in self.factories:
+            source = factory['address'].lower()
+            from_block = self.cursors.get(source, factory.get('start_block', 0) - 1) + 1
+            if from_block > latest:
+                continue
+
+            ranges = [
+                (start, min(start + self.block_span - 1, latest))
+                for start in range(from_block, latest + 1, self.block_span)
+            ]
+            # Scan in windows of parallel ranges so a long first sync keeps its progress
+            window = self.max_concurrency * 4
+            for i in range(0, len(ranges), window):
+                chunk = ranges[i:i + window]
+                results = await asyncio.gather(*[
+                    self._scan_range(factory, start, end) for start, end in chunk
+                ])
+                new_pools = [pool for batch in results for pool in batch]
+
+                # Persist pools before advancing the cursor so a crash never skips blocks
+                self.store.save_pools(self.chain, new_pools)
+                self.store.set_cursor(self.chain, source, chunk[-1][1])
+                self.cursors[source] = chunk[-1][1]
+                for pool in new_pools:
+                    self.pools[pool.address] = pool
+                    self._by_venue[(pool.dex, pool.token0, pool.token1)] = pool
+                discovered.extend(new_pools)
+
+        # Covers every pool, not just this pass: tokens of pools persisted before
+        # a crash (or loaded from the snapshot) still lack metadata
+        await self._fetch_token_metadata(self.pools.values())
+        if discovered:
+            v2_dexes = {f['name'] for f in self.factories if f['kind'] == 'v2'}
+            await self.refresh_reserves([p for p in discovered if p.dex in v2_dexes], latest)
+            logger.info(f"Indexed {len(discovered)} new pools on {self.chain} up to block {latest}")
+        return len(discovered)
+
+    async def refresh_reserves(self, pools: List[PoolInfo], block: int, batch_size: int = 100):
+        """Batch getReserves() over V2-style pairs at ``block`` and persist the result"""
+        for i in range(0, len(pools), batch_size):
+            batch = pools[i:i + batch_size]
+            results = await self.endpoint.batch([
+                ('eth_call', [{'to': p.address, 'data': GET_RESERVES_SELECTOR}, hex(block)])
+                for p in batch
+            ])
+            for pool, result in zip(batch, results):
+                if not result or len(result) < 2 + 64 * 2:
+                    continue
+                raw = bytes.fromhex(result[2:])
+                pool.reserve0 = int.from_bytes(raw[0:32], 'big')
+                pool.reserve1 = int.from_bytes(raw[32:64], 'big')
+                pool.updated_block = block
+            self.store.save_pools(self.chain, batch)
+
+    async def _scan_range(self, factory: Dict, start: int, end: int) -> List[PoolInfo]:
+        topic = POOL_CREATED_TOPIC if factory['kind'] == 'v3' else PAIR_CREATED_TOPIC
+        try:
+            async with self.semaphore:
+                logs = await self.endpoint.request('eth_getLogs', [{
+                    'address': factory['address'],
+                    'topics': [topic],
+                    'fromBlock': hex(start),
+                    'toBlock': hex(end)
+                }])
+        except RPCError as e:
+            if start == end or not self._is_range_error(e.message):
+                raise
+            # Node caps result size; bisect the range and retry both halves
+            mid = (start + end) // 2
+            left, right = await asyncio.gather(
+                self._scan_range(factory, start, mid),
+                self._scan_range(factory, mid + 1, end)
+            )
+            return left + right
+
+        return [self._decode_log(factory, log) for log in logs]
+
+    def _decode_log(self, factory: Dict, log: Dict) -> PoolInfo:
+        topics = log['topics']
+        data = bytes.fromhex(log['data'][2:])
+        token0 = Web3.to_checksum_address('0x' + topics[1][-40:])
+        token1 = Web3.to_checksum_address('0x' + topics[2][-40:])
+
+        if factory['kind'] == 'v3':
+            # fee is the third indexed topic in hundredths of a bip, pool is the second data word
+            fee_bps = int(topics[3], 16) / 100
+            address = Web3.to_checksum_address(data[44:64])
+        else:
+            fee_bps = factory.get('fee_bps', DEFAULT_V2_FEE_BPS)
+            address = Web3.to_checksum_address(data[12:32])
+
+        return PoolInfo(
+            address=address,
+            dex=factory['name'],
+            token0=token0,
+            token1=token1,
+            fee_bps=fee_bps,
+            updated_block=int(log['blockNumber'], 16)
+        )
+
+    async def _fetch_token_metadata(self, pools: Iterable[PoolInfo], batch_size: int = 100):
+        missing = list({
+            token for pool in pools for token in (pool.token0, pool.token1)
+            if token not in self.tokens
+        })
+        fetched = []
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i + batch_size]
+            calls = []
+            for token in batch:
+                calls.append(('eth_call', [{'to': token, 'data': DECIMALS_SELECTOR}, 'latest']))
+                calls.append(('eth_call', [{'to': token, 'data': SYMBOL_SELECTOR}, 'latest']))
+            results = await self.endpoint.batch(calls)
+
+            for j, token in enumerate(batch):
+                decimals_raw, symbol_raw = results[2 * j], results[2 * j + 1]
+                if not decimals_raw or decimals_raw == '0x':
+                    # Failed call (e.g. rate limited); stored metadata is permanent,
+                    # so leave the token missing and retry on the next catch_up
+                    continue
+                info = TokenInfo(
+                    address=token,
+                    symbol=self._decode_symbol(symbol_raw),
+                    decimals=int(decimals_raw, 16)
+                )
+                self.tokens[token] = info
+                fetched.append(info)
+
+        if fetched:
+            self.store.save_tokens(self.chain, fetched)
+            logger.info(f"Fetched metadata for {len(fetched)} tokens on {self.chain}")
+
+    @staticmethod
+    def _decode_symbol(result: Optional[str]) -> str:
+        if not result or result == '0x':
+            return ''
+        raw = bytes.fromhex(result[2:])
+        try:
+            if len(raw) >= 64:
+                # Dynamic ABI string: offset, length, data
+                length = int.from_bytes(raw[32:64], 'big')
+                return raw[64:64 + length].decode('utf-8', errors='ignore')
+            # Legacy tokens (e.g. MKR) return a bytes32 symbol
+            return raw.rstrip(b'\x00').decode('utf-8', errors='ignore')
+        except Exception:
+            return ''
+
+    @staticmethod
+    def _is_range_error(message: str) -> bool:
+        # Providers word the log result cap differently
+        return 'range' in message or 'more than' in message or 'too many' in message
+
+
+# Solana AMM account layouts: dataSize (and the Anchor discriminator, where the
+# program has one) select pool accounts; offsets locate mints and fees
+SOLANA_LAYOUTS = {
+    'raydium': {
+        'data_size': 752,  # AMM v4 LiquidityState
+        'mint0': 400,
+        'mint1': 432,
+        'decimals0': 32,
+        'decimals1': 40,
+        'fee_bps': 25
+    },
+    'orca': {
+        'data_size': 653,  # Whirlpool
+        'discriminator': hashlib.sha256(b'account:Whirlpool').digest()[:8],
+        'mint0': 101,
+        'mint1': 181,
+        'fee_rate': 45
+    }
+}
+SPL_MINT_DECIMALS = 44  # offset of the decimals byte in an SPL Mint account
+
+
+class SolanaPoolIndexer:
+    """Discovers Raydium/Orca pools from program accounts into a PoolStore.
+
+    Each pass lists only the pubkeys of a program's pool accounts
+    (getProgramAccounts with dataSize/memcmp filters and an empty dataSlice)
+    and fetches account data just for pools missing from the store, so after
+    the first sync a pass costs one small listing per program.
+    """
+
+    def __init__(self, store: PoolStore, rpc_url: str, programs: Dict[str, str], batch_size: int = 100):
+        self.store = store
+        self.endpoint = get_endpoint(rpc_url)
+        self.programs = programs
+        self.batch_size = batch_size  # getMultipleAccounts takes at most 100 keys
+        self.chain = 'solana'
+        self.tokens: Dict[str, TokenInfo] = {}
+        self.pools: Dict[str, PoolInfo] = {}
+        self.cursors: Dict[str, int] = {}
+        self._running = False
+
+    def load_snapshot(self) -> int:
+        start = time.perf_counter()
+        self.tokens, self.pools, self.cursors = self.store.load(self.chain)
+        logger.info(
+            f"Loaded {len(self.pools)} pools and {len(self.tokens)} tokens for {self.chain} "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return len(self.pools)
+
+    async def run(self, interval: float = 300):
+        self._running = True
+        while self._running:
+            try:
+                await self.catch_up()
+            except Exception as e:
+                logger.error(f"Pool indexing error for {self.chain}: {e}")
+            await asyncio.sleep(interval)
+
+    def stop(self):
+        self._running = False
+
+    async def catch_up(self) -> int:
+        results = await asyncio.gather(*[
+            self._scan_program(dex, program)
+            for dex, program in self.programs.items()
+        ], return_exceptions=True)
+
+        discovered: List[PoolInfo] = []
+        for dex, result in zip(self.programs, results):
+            if isinstance(result, Exception):
+                logger.error(f"Solana pool scan failed for {dex}: {result}")
+                continue
+            discovered.extend(result)
+
+        # Covers every pool, as on EVM: mints whose lookup failed are retried
+        await self._fetch_mint_decimals(self.pools.values())
+        if discovered:
+            logger.info(f"Indexed {len(discovered)} new pools on {self.chain}")
+        return len(discovered)
+
+    async def _scan_program(self, dex: str, program: str) -> List[PoolInfo]:
+        layout = SOLANA_LAYOUTS[dex]
+        filters = [{'dataSize': layout['data_size']}]
+        if 'discriminator' in layout:
+            filters.append({'memcmp': {'offset': 0, 'bytes': base58.b58encode(layout['discriminator']).decode()}})
+        listing = await self.endpoint.request('getProgramAccounts', [program, {
+            'encoding': 'base64',
+            'filters': filters,
+            'dataSlice': {'offset': 0, 'length': 0},
+            'withContext': True
+        }])
+        slot = listing['context']['slot']
+        new = [account['pubkey'] for account in listing['value'] if account['pubkey'] not in self.pools]
+
+        chunks = [new[i:i + self.batch_size] for i in range(0, len(new), self.batch_size)]
+        results = await asyncio.gather(*[
+            self.endpoint.request('getMultipleAccounts', [keys, {'encoding': 'base64'}])
+            for keys in chunks
+        ])
+        pools = []
+        for keys, result in zip(chunks, results):
+            for pubkey, account in zip(keys, result['value']):
+                if account is None:
+                    continue  # Closed since the listing
+                pools.append(self._decode_pool(dex, pubkey, base64.b64decode(account['data'][0]), slot))
+
+        # Persist pools before advancing the cursor, as for EVM factories
+        self.store.save_pools(self.chain, pools)
+        self.store.set_cursor(self.chain, program, slot)
+        self.cursors[program] = slot
+        for pool in pools:
+            self.pools[pool.address] = pool
+        return pools
+
+    def _decode_pool(self, dex: str, pubkey: str, data: bytes, slot: int) -> PoolInfo:
+        layout = SOLANA_LAYOUTS[dex]
+        mint0 = base58.b58encode(data[layout['mint0']:layout['mint0'] + 32]).decode()
+        mint1 = base58.b58encode(data[layout['mint1']:layout['mint1'] + 32]).decode()
+
+        if 'fee_rate' in layout:
+            # Whirlpool fee_rate is in hundredths of a bip
+            fee_bps = struct.unpack_from('<H', data, layout['fee_rate'])[0] / 100
+        else:
+            fee_bps = layout['fee_bps']
+            # Raydium keeps both decimals in the pool account; no mint lookup needed
+            tokens = [
+                TokenInfo(mint, '', struct.unpack_from('<Q', data, offset)[0])
+                for mint, offset in ((mint0, layout['decimals0']), (mint1, layout['decimals1']))
+                if mint not in self.tokens
+            ]
+            for token in tokens:
+                self.tokens[token.address] = token
+            self.store.save_tokens(self.chain, tokens)
+
+        return PoolInfo(pubkey, dex, mint0, mint1, fee_bps, updated_block=slot)
+
+    async def _fetch_mint_decimals(self, pools: Iterable[PoolInfo]):
+        missing = list({
+            mint for pool in pools for mint in (pool.token0, pool.token1)
+            if mint not in self.tokens
+        })
+        chunks = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        results = await asyncio.gather(*[
+            self.endpoint.request('getMultipleAccounts', [mints, {
+                'encoding': 'base64',
+                'dataSlice': {'offset': SPL_MINT_DECIMALS, 'length': 1}
+            }])
+            for mints in chunks
+        ], return_exceptions=True)
+
+        fetched = []
+        for mints, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                logger.error(f"Mint lookup failed on {self.chain}: {result}")
+                continue
+            for mint, account in zip(mints, result['value']):
+                data = base64.b64decode(account['data'][0]) if account else b''
+                if not data:
+                    continue  # Left missing and retried on the next catch_up
+                # SPL mints carry no symbol on-chain (it lives in Metaplex metadata)
+                info = TokenInfo(mint, '', data[0])
+                self.tokens[mint] = info
+                fetched.append(info)
+
+        if fetched:
+            self.store.save_tokens(self.chain, fetched)
+            logger.info(f"Fetched metadata for {len(fetched)} tokens on {self.chain}")
+
+
+async def main():
+    """One catch-up pass over the EVM factories and Solana programs, e.g. to seed a fresh snapshot"""
+    from config import NETWORK, POOL_DB_PATH, POOL_FACTORIES, RPC_ENDPOINTS, RPC_URLS, SOLANA_AMM_PROGRAMS
+    from rpc_provider import close_endpoints
+
+    store = PoolStore(POOL_DB_PATH)
+    indexers = [
+        PoolIndexer(store, RPC_URLS[NETWORK], NETWORK, POOL_FACTORIES.get(NETWORK, [])),
+        SolanaPoolIndexer(store, RPC_ENDPOINTS[0], SOLANA_AMM_PROGRAMS)
+    ]
+    try:
+        for indexer in indexers:
+            indexer.load_snapshot()
+            await indexer.catch_up()
+    finally:
+        await close_endpoints()
+        store.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(main())
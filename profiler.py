@@ -0,0 +1,252 @@
+"""Always-on sampling profiler and event-loop lag monitor.
+
+A daemon thread samples every thread's Python stack through
+``sys._current_frames()`` and, less often, the stacks of suspended asyncio
+tasks. Counts are kept as collapsed stacks (``frame;frame;frame count``),
+which flamegraph.pl, inferno or speedscope render directly.
+
+Event-loop lag is measured by a probe coroutine. While the loop is stuck
+past the threshold, the sampler also records the loop thread's stack under
+a ``slow-callback`` root, so blocking callbacks show up by name. Sampler
+wake-up lateness is tracked as a proxy for GIL contention.
+
+Dumps are written on SIGUSR2 or served by the admin endpoint.
+"""
+import asyncio
+import logging
+import os
+import selectors
+import signal
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, Optional
+
+from aiohttp import web
+
+from config import LOOP_LAG_THRESHOLD_MS, PROFILE_DIR, PROFILER_ENABLED, PROFILER_HZ
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfiler:
+    def __init__(
+        self,
+        hz: float = 49,
+        task_every: int = 10,
+        lag_interval: float = 0.05,
+        lag_threshold_ms: float = 50,
+        output_dir: str = 'profiles',
+        max_stacks: int = 20000
+    ):
+        self.interval = 1 / hz
+        self.task_every = task_every  # sample asyncio tasks on every Nth tick
+        self.lag_interval = lag_interval
+        self.lag_threshold = lag_threshold_ms / 1000
+        self.output_dir = output_dir
+        self.max_stacks = max_stacks  # distinct stacks kept between dumps; the rest fold into (overflow)
+
+        self.stacks: Counter = Counter()
+        self.lags = deque(maxlen=10000)
+        self.sampler_delays = deque(maxlen=10000)
+        self.slow_callbacks = 0
+        self.samples = 0
+        self.sample_time = 0.0
+
+        self._labels: Dict[object, str] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_tick = time.monotonic()
+        self._started_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._lag_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._loop = loop or asyncio.get_event_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._running = True
+        self._started_at = self._last_tick = time.monotonic()
+        self._lag_task = self._loop.create_task(self._probe_lag())
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        logger.info(f"Sampling profiler started at {1 / self.interval:.0f}Hz")
+
+    def stop(self):
+        self._running = False
+        if self._lag_task:
+            self._lag_task.cancel()
+
+    def install_signal_handler(self):
+        self._loop.add_signal_handler(signal.SIGUSR2, self.dump)
+
+    def _run(self):
+        tick = 0
+        expected = time.perf_counter() + self.interval
+        while self._running:
+            now = time.perf_counter()
+            # A late wake-up means this thread waited on the GIL (or the CPU)
+            self.sampler_delays.append(max(now - expected, 0.0))
+
+            self._sample_threads()
+            tick += 1
+            if tick % self.task_every == 0 and self._loop is not None:
+                self._loop.call_soon_threadsafe(self._sample_tasks)
+
+            self.sample_time += time.perf_counter() - now
+            expected = time.perf_counter() + self.interval
+            time.sleep(self.interval)
+
+    def _sample_threads(self):
+        me = threading.get_ident()
+        loop_blocked = time.monotonic() - self._last_tick > self.lag_interval + self.lag_threshold
+        with self._lock:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = self._collapse(frame)
+                name = self._thread_names.get(thread_id)
+                if name is None:
+                    # New thread (e.g. an executor worker spun up on demand)
+                    self._thread_names = {t.ident: t.name for t in threading.enumerate()}
+                    name = self._thread_names.get(thread_id, str(thread_id))
+                self._count(f"thread:{name};{stack}")
+                # A loop waiting in select() is idle, not stuck in a callback
+                if (loop_blocked and thread_id == self._loop_thread_id
+                        and frame.f_code.co_filename != selectors.__file__):
+                    self._count(f"slow-callback;{stack}")
+            self.samples += 1
+
+    def _sample_tasks(self):
+        # Runs on the loop thread, where all_tasks() and coroutine state are safe to read
+        start = time.perf_counter()
+        current = asyncio.current_task()
+        with self._lock:
+            for task in asyncio.all_tasks(self._loop):
+                if task is current:
+                    continue
+                coro = task.get_coro()
+                stack = self._await_chain(coro)
+                if stack:
+                    # Keyed by coroutine, not the per-task Task-N name, so every
+                    # instance of one coroutine folds into the same flamegraph root
+                    self._count(f"task:{getattr(coro, '__qualname__', type(coro).__name__)};{stack}")
+        self.sample_time += time.perf_counter() - start
+
+    def _count(self, stack: str):
+        if stack not in self.stacks and len(self.stacks) >= self.max_stacks:
+            stack = '(overflow)'
+        self.stacks[stack] += 1
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = (
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            )
+        return label
+
+    def _collapse(self, frame) -> str:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        return ';'.join(reversed(labels))
+
+    def _await_chain(self, coro) -> str:
+        # A suspended coroutine's frame has no f_back; follow what it awaits
+        # instead, down to the innermost coroutine (a Future ends the chain)
+        labels = []
+        while coro is not None:
+            frame = (
+                getattr(coro, 'cr_frame', None) or getattr(coro, 'gi_frame', None)
+                or getattr(coro, 'ag_frame', None)
+            )
+            if frame is None:
+                break
+            labels.append(self._label(frame.f_code))
+            coro = (
+                getattr(coro, 'cr_await', None) or getattr(coro, 'gi_yieldfrom', None)
+                or getattr(coro, 'ag_await', None)
+            )
+        return ';'.join(labels)
+
+    async def _probe_lag(self):
+        while self._running:
+            before = time.monotonic()
+            self._last_tick = before
+            await asyncio.sleep(self.lag_interval)
+            lag = time.monotonic() - before - self.lag_interval
+            self.lags.append(lag)
+            if lag > self.lag_threshold:
+                self.slow_callbacks += 1
+
+    def collapsed(self, reset: bool = False) -> str:
+        with self._lock:
+            lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+            if reset:
+                self.stacks.clear()
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, reset: bool = True) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"profile-{os.getpid()}-{int(time.time())}.collapsed")
+        with open(path, 'w') as f:
+            f.write(self.collapsed(reset))
+        logger.info(f"Wrote collapsed stacks to {path} ({self.stats()})")
+        return path
+
+    def stats(self) -> Dict[str, float]:
+        lags = sorted(self.lags)
+        delays = sorted(self.sampler_delays)
+        elapsed = time.monotonic() - self._started_at
+        return {
+            'samples': self.samples,
+            'overhead_pct': self.sample_time / elapsed * 100 if elapsed else 0.0,
+            'loop_lag_p50_ms': lags[len(lags) // 2] * 1000 if lags else 0.0,
+            'loop_lag_p99_ms': lags[int(len(lags) * 0.99)] * 1000 if lags else 0.0,
+            'loop_lag_max_ms': lags[-1] * 1000 if lags else 0.0,
+            'slow_callbacks': self.slow_callbacks,
+            'sampler_delay_p99_ms': delays[int(len(delays) * 0.99)] * 1000 if delays else 0.0
+        }
+
+
+def start_profiler() -> Optional[SamplingProfiler]:
+    """Start the configured profiler on the running loop, with the SIGUSR2 dump handler"""
+    if not PROFILER_ENABLED:
+        return None
+    profiler = SamplingProfiler(
+        hz=PROFILER_HZ,
+        lag_threshold_ms=LOOP_LAG_THRESHOLD_MS,
+        output_dir=PROFILE_DIR
+    )
+    profiler.start(asyncio.get_running_loop())
+    profiler.install_signal_handler()
+    return profiler
+
+
+async def start_admin_server(profiler: SamplingProfiler, host: str = '127.0.0.1', port: int = 9901) -> web.AppRunner:
+    """Serve /debug/profile (collapsed stacks), /debug/profile/dump and /debug/stats"""
+
+    async def profile(request: web.Request) -> web.Response:
+        reset = request.query.get('reset') == '1'
+        return web.Response(text=profiler.collapsed(reset))
+
+    async def dump(request: web.Request) -> web.Response:
+        return web.json_response({'path': profiler.dump()})
+
+    async def stats(request: web.Request) -> web.Response:
+        return web.json_response(profiler.stats())
+
+    app = web.Application()
+    app.router.add_get('/debug/profile', profile)
+    app.router.add_post('/debug/profile/dump', dump)
+    app.router.add_get('/debug/stats', stats)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Profiler admin endpoint on http://{host}:{port}/debug/profile")
+    return runner
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+from web3 import AsyncWeb3
+from web3.providers.async_rpc import AsyncHTTPProvider
+
+logger = logging.getLogger(__name__)
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+METHOD_NOT_FOUND = -32601
+
+
+class RPCError(Exception):
+    """JSON-RPC error object returned by a node"""
+
+    def __init__(self, method: str, error: Dict):
+        self.method = method
+        self.code = error.get('code')
+        self.message = error.get('message', '')
+        super().__init__(f"{method} failed: {self.message}")
+
+
+class RPCEndpointPool:
+    """Keep-alive aiohttp connection pool and concurrency limit for one RPC endpoint.
+
+    Every AsyncWeb3 instance and raw JSON-RPC call for the same URL goes
+    through one session, so TCP/TLS connections are reused across callers.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 32,
+        max_concurrency: int = 64,
+        timeout: float = 10
+    ):
+        self.url = url
+        self.max_connections = max_connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._request_id = 0
+        self._use_txpool = False
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers=JSON_HEADERS
+            )
+        return self._session
+
+    def web3(self) -> AsyncWeb3:
+        return AsyncWeb3(PooledAsyncHTTPProvider(self))
+
+    async def post(self, data: bytes) -> bytes:
+        async with self.semaphore:
+            async with self.session.post(self.url, data=data) as response:
+                response.raise_for_status()
+                return await response.read()
+
+    async def request(self, method: str, params: List) -> Any:
+        self._request_id += 1
+        payload = {'jsonrpc': '2.0', 'id': self._request_id, 'method': method, 'params': params}
+        body = json.loads(await self.post(json.dumps(payload).encode()))
+        if 'error' in body:
+            raise RPCError(method, body['error'])
+        return body['result']
+
+    async def batch(self, calls: List[Tuple[str, List]]) -> List[Any]:
+        """Send several calls in one JSON-RPC batch; failed entries come back as None"""
+        if not calls:
+            return []
+        payload = [
+            {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        body = json.loads(await self.post(json.dumps(payload).encode()))
+        if isinstance(body, dict):
+            # Some nodes answer a rejected batch with a single error object
+            raise RPCError('batch', body.get('error', {}))
+
+        results: List[Any] = [None] * len(calls)
+        for item in body:
+            if 'error' in item:
+                logger.debug(f"Batch entry {calls[item['id']][0]} failed: {item['error']}")
+                continue
+            results[item['id']] = item['result']
+        return results
+
+    async def pending_transactions(self) -> List[Dict]:
+        """Transactions in the node's mempool, as raw JSON-RPC dicts.
+
+        Uses eth_pendingTransactions (Nethermind, Erigon, OpenEthereum) and
+        falls back to txpool_content (Geth and its forks) once the node
+        reports the method as unsupported. A 'pending' block is not a
+        substitute: it only holds what the node would mine next.
+        """
+        if not self._use_txpool:
+            try:
+                return await self.request('eth_pendingTransactions', [])
+            except RPCError as e:
+                if e.code != METHOD_NOT_FOUND:
+                    raise
+                self._use_txpool = True
+        content = await self.request('txpool_content', [])
+        return [
+            tx
+            for by_nonce in content.get('pending', {}).values()
+            for tx in by_nonce.values()
+        ]
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class PooledAsyncHTTPProvider(AsyncHTTPProvider):
+    """AsyncHTTPProvider that sends through a shared RPCEndpointPool"""
+
+    def __init__(self, endpoint: RPCEndpointPool):
+        super().__init__(endpoint.url)
+        self.endpoint = endpoint
+
+    async def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        raw_response = await self.endpoint.post(request_data)
+        return self.decode_rpc_response(raw_response)
+
+
+_endpoints: Dict[str, RPCEndpointPool] = {}
+
+
+def get_endpoint(url: str, **kwargs) -> RPCEndpointPool:
+    """Process-wide pool for ``url``; options only apply on first use"""
+    if url not in _endpoints:
+        _endpoints[url] = RPCEndpointPool(url, **kwargs)
+    return _endpoints[url]
+
+
+async def close_endpoints():
+    await asyncio.gather(*[endpoint.close() for endpoint in _endpoints.values()])
+    _endpoints.clear()
@@ -0,0 +1,178 @@
+"""Hot-reloadable strategy and risk settings.
+
+Defaults come from config.py; a JSON file (RUNTIME_CONFIG_PATH, default
+``runtime_config.json``) overrides any subset of StrategyConfig fields:
+
+    {"min_profit_threshold": 2.5, "max_gas": {"arbitrum": 2000000000}}
+
+The file is re-read when its mtime changes or on SIGHUP. A new snapshot is
+validated as a whole and handed to every subscriber in one synchronous pass,
+so live components never see a half-applied update and keep their
+connections, caches and pool state.
+"""
+import asyncio
+import dataclasses
+import json
+import logging
+import math
+import os
+import signal
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from config import (
+    BUNDLE_MAX_LEGS, BUNDLE_WINDOW_BLOCKS, CIRCUIT_BREAKER,
+    EXECUTION_TIMEOUT, MAX_SLIPPAGE, MEMPOOL_PROCESSORS,
+    MIN_PROFIT_THRESHOLD, POLL_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+
+RUNTIME_CONFIG_PATH = os.getenv('RUNTIME_CONFIG_PATH', 'runtime_config.json')
+
+
+class ConfigError(ValueError):
+    """Raised when a runtime config file fails validation"""
+
+
+@dataclass(frozen=True)
+class StrategyConfig:
+    execution_timeout: float = EXECUTION_TIMEOUT
+    poll_interval: float = POLL_INTERVAL
+    min_profit_threshold: float = MIN_PROFIT_THRESHOLD
+    max_slippage: float = MAX_SLIPPAGE
+    circuit_breaker: float = CIRCUIT_BREAKER
+    bundle_window_blocks: int = BUNDLE_WINDOW_BLOCKS
+    bundle_max_legs: int = BUNDLE_MAX_LEGS
+    mempool_processors: int = MEMPOOL_PROCESSORS
+    max_gas: Dict[str, int] = field(default_factory=dict)  # per Chain value, overrides MempoolConfig
+    min_profit: Dict[str, float] = field(default_factory=dict)  # per chain, overrides min_profit_threshold
+
+    def validate(self):
+        if self.mempool_processors < 1:
+            raise ConfigError("mempool_processors must be at least 1")
+        if self.execution_timeout <= 0 or self.poll_interval <= 0:
+            raise ConfigError("execution_timeout and poll_interval must be positive")
+        if not 0 <= self.max_slippage < 100:
+            raise ConfigError("max_slippage must be a percentage in [0, 100)")
+        if self.min_profit_threshold < 0 or any(value < 0 for value in self.min_profit.values()):
+            raise ConfigError("minimum profits cannot be negative")
+        if self.circuit_breaker > 0:
+            raise ConfigError("circuit_breaker is a loss limit and must be <= 0")
+        if self.bundle_window_blocks < 1 or self.bundle_max_legs < 2:
+            raise ConfigError("bundle_window_blocks must be >= 1 and bundle_max_legs >= 2")
+        if any(value <= 0 for value in self.max_gas.values()):
+            raise ConfigError("max_gas values must be positive")
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StrategyConfig':
+        known = {f.name: f for f in dataclasses.fields(cls)}
+        unknown = set(data) - set(known)
+        if unknown:
+            raise ConfigError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+
+        values = {}
+        for name, value in data.items():
+            values[name] = _coerce(name, known[name].type, value)
+        config = cls(**values)
+        config.validate()
+        return config
+
+
+def _coerce(name: str, expected, value):
+    # bool is an int subclass; never accept it for numeric settings
+    if isinstance(value, bool):
+        raise ConfigError(f"{name}: expected a number, got {value!r}")
+    if expected is int:
+        if not isinstance(value, int):
+            raise ConfigError(f"{name}: expected an integer, got {value!r}")
+        return value
+    if expected is float:
+        if not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ConfigError(f"{name}: expected a finite number, got {value!r}")
+        return float(value)
+
+    # Dict[str, int] / Dict[str, float] per-chain overrides
+    if not isinstance(value, dict):
+        raise ConfigError(f"{name}: expected an object keyed by chain, got {value!r}")
+    item_type = expected.__args__[1]
+    return {str(key): _coerce(f"{name}.{key}", item_type, item) for key, item in value.items()}
+
+
+class RuntimeConfig:
+    """Typed config snapshot that live components subscribe to"""
+
+    def __init__(self, path: Optional[str] = RUNTIME_CONFIG_PATH):
+        self.path = path
+        self.current = StrategyConfig()
+        self._subscribers: List[Callable[[StrategyConfig], None]] = []
+        self._mtime: Optional[float] = None
+        self._running = False
+
+    def load(self) -> StrategyConfig:
+        """Initial load; unlike reload, an invalid file here is fatal"""
+        self.current = self._read()
+        self._notify()
+        return self.current
+
+    def subscribe(self, callback: Callable[[StrategyConfig], None]):
+        self._subscribers.append(callback)
+        callback(self.current)
+
+    def reload(self) -> bool:
+        try:
+            config = self._read()
+        except (ConfigError, OSError, json.JSONDecodeError) as e:
+            logger.error(f"Runtime config rejected, keeping current values: {e}")
+            return False
+
+        if config == self.current:
+            return False
+        changed = {
+            f.name: getattr(config, f.name)
+            for f in dataclasses.fields(config)
+            if getattr(config, f.name) != getattr(self.current, f.name)
+        }
+        self.current = config
+        self._notify()
+        logger.info(f"Runtime config applied: {changed}")
+        return True
+
+    async def watch(self, interval: float = 1.0):
+        self._running = True
+        while self._running:
+            if self.path and self._file_mtime() != self._mtime:
+                self.reload()
+            await asyncio.sleep(interval)
+
+    def install_signal_handler(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        loop = loop or asyncio.get_event_loop()
+        loop.add_signal_handler(signal.SIGHUP, self.reload)
+
+    def stop(self):
+        self._running = False
+
+    def _notify(self):
+        # Subscribers only assign attributes; running them back to back with no
+        # await in between makes the update atomic for the event loop
+        for callback in self._subscribers:
+            try:
+                callback(self.current)
+            except Exception as e:
+                logger.error(f"Runtime config subscriber failed: {e}")
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _read(self) -> StrategyConfig:
+        self._mtime = self._file_mtime()
+        if self._mtime is None:
+            return StrategyConfig()
+        with open(self.path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ConfigError("Runtime config must be a JSON object")
+        return StrategyConfig.from_dict(data)
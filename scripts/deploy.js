@@ -1,13 +1,15 @@
 const hre = require("hardhat");
 
 async function main() {
-  // AAVE V3 Pool Addresses Provider on Polygon
+  // AAVE V3 Pool Addresses Provider (same address on Polygon and Arbitrum)
   const AAVE_POOL_ADDRESSES_PROVIDER = "0xa97684ead0e402dC232d5A977953DF7ECBaB3CDb";
+  // Balancer V2 Vault (same address on every chain)
+  const BALANCER_VAULT = "0xBA12222222228d8Ba445958a75a0704d566BF2C8";
   
   console.log("Deploying FlashLoanArbitrage contract...");
   
   const FlashLoanArbitrage = await hre.ethers.getContractFactory("FlashLoanArbitrage");
-  const flashLoan = await FlashLoanArbitrage.deploy(AAVE_POOL_ADDRESSES_PROVIDER);
+  const flashLoan = await FlashLoanArbitrage.deploy(AAVE_POOL_ADDRESSES_PROVIDER, BALANCER_VAULT);
   
   await flashLoan.deployed();
   
@@ -0,0 +1,102 @@
+from eth_abi import decode
+
+from bundle_builder import (
+    REQUEST_FLASH_LOAN, SWAP_CAMELOT, SWAP_UNISWAP_V2, SWAPS_TYPE,
+    Bundle, BundleBuilder, Opportunity, SwapLeg
+)
+
+WETH = '0x82aF49447D8a07e3bd95BD0d56f35241523fBab1'
+USDC = '0xaf88d065e77c8cC2239327C5EDb3A432268e5831'
+ROUTER = '0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506'
+
+
+def opportunity(pools, block=100, value=1.0, loan_token=WETH, loan_amount=10, reads=None, legs=2):
+    return Opportunity(
+        legs=[SwapLeg(ROUTER, loan_token, USDC, loan_amount, 1) for _ in range(legs)],
+        loan_token=loan_token,
+        loan_amount=loan_amount,
+        profit=int(value * 100),
+        reads=frozenset(reads if reads is not None else pools),
+        writes=frozenset(pools),
+        block_number=block,
+        value=value
+    )
+
+
+def test_conflicts_on_shared_writes_and_read_write_overlap():
+    a = opportunity({'p1', 'p2'})
+    assert a.conflicts_with(opportunity({'p2', 'p3'}))
+    assert a.conflicts_with(opportunity({'p3'}, reads={'p1', 'p3'}))
+    assert not a.conflicts_with(opportunity({'p3', 'p4'}))
+    # Two readers of the same pool do not move its price
+    assert not opportunity({'p5'}, reads={'p1', 'p5'}).conflicts_with(opportunity({'p6'}, reads={'p1', 'p6'}))
+
+
+def test_flush_keeps_highest_value_of_conflicting_opportunities():
+    builder = BundleBuilder()
+    low, high, other = opportunity({'p1'}, value=1.0), opportunity({'p1', 'p2'}, value=5.0), opportunity({'p3'})
+    for item in (low, high, other):
+        assert builder.add(item)
+
+    bundles = builder.flush(101)
+    assert len(bundles) == 1
+    assert bundles[0].opportunities == [high, other]
+    assert builder.pending == []
+
+
+def test_same_loan_token_shares_one_loan_sized_for_the_largest():
+    builder = BundleBuilder()
+    builder.add(opportunity({'p1'}, loan_amount=10))
+    builder.add(opportunity({'p2'}, loan_amount=30))
+    builder.add(opportunity({'p3'}, loan_token=USDC, loan_amount=5))
+
+    bundles = {bundle.loan_token: bundle for bundle in builder.flush(101)}
+    assert bundles[WETH].loan_amount == 30
+    assert len(bundles[WETH].opportunities) == 2
+    assert bundles[USDC].loan_amount == 5
+
+
+def test_bundles_split_at_max_legs():
+    builder = BundleBuilder(max_legs=4)
+    for i in range(3):
+        builder.add(opportunity({f'p{i}'}))
+    assert [len(bundle.legs) for bundle in builder.flush(101)] == [4, 2]
+
+
+def test_add_rejects_duplicates_and_opportunities_without_pools():
+    builder = BundleBuilder()
+    assert builder.add(opportunity({'p1'}))
+    assert not builder.add(opportunity({'p1'}))
+    assert builder.add(opportunity({'p1'}, block=101))
+    assert not builder.add(opportunity(set()))
+    assert not builder.add(opportunity(set(), reads={'p2'}))
+
+
+def test_window_is_due_after_window_blocks_and_drops_stale_quotes():
+    builder = BundleBuilder(window_blocks=2)
+    assert not builder.due(100)
+    builder.add(opportunity({'p1'}, block=100))
+    builder.add(opportunity({'p2'}, block=101))
+    assert not builder.due(101)
+    assert builder.due(102)
+    assert sum(len(bundle.opportunities) for bundle in builder.flush(102)) == 2
+    assert not builder.due(103)
+
+    # Polls skipped past the window: the quote no longer matches pool state
+    builder.add(opportunity({'p3'}, block=103))
+    assert builder.flush(110) == []
+
+
+def test_encode_call_round_trips_swaps():
+    legs = [
+        SwapLeg(ROUTER, WETH, USDC, 10, 9, SWAP_CAMELOT),
+        SwapLeg(ROUTER, USDC, WETH, 0, 10, SWAP_UNISWAP_V2)
+    ]
+    bundle = Bundle(WETH, 10, [Opportunity(legs, WETH, 10, 1, frozenset({'p1'}), frozenset({'p1'}))])
+
+    calldata = bundle.encode_call('balancer')
+    assert calldata[:4] == REQUEST_FLASH_LOAN['balancer'].selector
+    token, amount, params = decode(['address', 'uint256', 'bytes'], calldata[4:])
+    assert (token.lower(), amount) == (WETH.lower(), 10)
+    swaps = decode([SWAPS_TYPE], params)[0]
+    assert [(swap[3], swap[4], swap[5]) for swap in swaps] == [(10, 9, SWAP_CAMELOT), (0, 10, SWAP_UNISWAP_V2)]
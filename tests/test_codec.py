@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from eth_abi import decode
+
+import codec
+from codec import FRAME_ERRORS, CallEncoder, FrameDecoder, encode_bytes
+
+TX = {
+    'hash': '0x' + 'ab' * 32,
+    'from': '0x' + '11' * 20,
+    'to': '0x' + '22' * 20,
+    'input': '0x38ed1739',
+    'value': '0xde0b6b3a7640000',
+    'gas': '0x5208',
+    'maxFeePerGas': '0x3b9aca00',
+    'nonce': '0x7',
+    'blockHash': None,  # outside the schema, dropped
+}
+
+
+def frame(result):
+    return json.dumps({
+        'jsonrpc': '2.0',
+        'method': 'eth_subscription',
+        'params': {'subscription': '0x1', 'result': result}
+    })
+
+
+@pytest.fixture(params=['msgspec', 'json'])
+def decoder(request, monkeypatch):
+    if request.param == 'json':
+        monkeypatch.setattr(codec, 'msgspec', None)
+    elif codec.msgspec is None:
+        pytest.skip('msgspec not installed')
+    return FrameDecoder('pending_tx')
+
+
+def test_pending_tx_frame_decodes_schema_fields(decoder):
+    tx = decoder.decode(frame(TX))
+    assert tx == {
+        'hash': TX['hash'], 'from': TX['from'], 'to': TX['to'], 'input': TX['input'],
+        'value': 10 ** 18, 'gas': 21000, 'gasPrice': None,
+        'maxFeePerGas': 10 ** 9, 'maxPriorityFeePerGas': None, 'nonce': 7
+    }
+    # HTTP polling payloads normalise to the same dict
+    assert decoder.from_dict(TX) == tx
+
+
+def test_hash_only_notification_and_ack(decoder):
+    assert decoder.decode(frame(TX['hash'])) == {'hash': TX['hash']}
+    assert decoder.decode(json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': '0x1'})) is None
+
+
+@pytest.mark.parametrize('raw', ['{"params": ', frame(dict(TX, value='0xzz')), frame(42)])
+def test_malformed_frames_raise_frame_errors(decoder, raw):
+    with pytest.raises(FRAME_ERRORS):
+        decoder.decode(raw)
+
+
+def test_schema_mismatch_raises_frame_error():
+    if codec.msgspec is None:
+        pytest.skip('msgspec not installed')
+    # Typed decoding rejects a numeric quantity instead of passing it through
+    with pytest.raises(FRAME_ERRORS):
+        FrameDecoder('pending_tx').decode(frame(dict(TX, value=5)))
+
+
+def test_call_encoder_round_trips():
+    encoder = CallEncoder('requestFlashLoan(address,uint256,bytes)')
+    args = ('0x' + '33' * 20, 123, b'\x01\x02')
+    calldata = encoder.encode(args)
+    assert calldata[:4] == bytes(encoder.selector)
+    assert encoder.encode_hex(args) == '0x' + calldata.hex()
+    token, amount, data = decode(list(encoder.types), calldata[4:])
+    assert (token, amount, data) == args
+
+
+def test_call_encoder_splits_nested_tuples():
+    encoder = CallEncoder('operate((address,uint256)[],(uint8,uint256,(bool,uint8,uint8,uint256),bytes)[])')
+    assert encoder.types == ('(address,uint256)[]', '(uint8,uint256,(bool,uint8,uint8,uint256),bytes)[]')
+    args = ([('0x' + '44' * 20, 1)], [(1, 2, (True, 0, 1, 5), b'x')])
+    owners, actions = decode(list(encoder.types), encoder.encode(args)[4:])
+    assert (list(owners), list(actions)) == (args[0], args[1])
+
+
+@pytest.mark.parametrize('data', [b'', b'\x01', b'\xff' * 32, b'\xaa' * 33])
+def test_encode_bytes_matches_eth_abi(data):
+    assert encode_bytes(data) == codec.encode(['bytes'], [data])
@@ -0,0 +1,69 @@
+import asyncio
+
+from mempool_monitor import Chain, EnhancedMempoolMonitor, MempoolConfig
+from runtime_config import StrategyConfig
+
+
+def make_monitor(callback=None):
+    async def noop(tx_data):
+        pass
+
+    config = MempoolConfig(Chain.ETH, ['http://127.0.0.1:8545'], [], 1.0, 100 * 10 ** 9)
+    return EnhancedMempoolMonitor([config], callback or noop)
+
+
+def live_processors(monitor):
+    return [task for task in monitor._processor_tasks.values() if not task.done()]
+
+
+def test_resize_keeps_one_processor_per_slot():
+    async def run():
+        monitor = make_monitor()
+        monitor._running = True
+        counts = []
+        for size in (4, 2, 4, 1, 3):
+            monitor.apply_config(StrategyConfig(mempool_processors=size))
+            await asyncio.sleep(0)
+            counts.append((sorted(monitor._processor_tasks), len(live_processors(monitor))))
+        monitor.stop()
+        for task in monitor._processor_tasks.values():
+            task.cancel()
+        return counts
+
+    assert asyncio.run(run()) == [
+        ([0, 1, 2, 3], 4), ([0, 1], 2), ([0, 1, 2, 3], 4), ([0], 1), ([0, 1, 2], 3)
+    ]
+
+
+def test_shrinking_does_not_cancel_in_flight_analysis():
+    async def run():
+        monitor = make_monitor()
+        monitor._running = True
+        started, finished = asyncio.Event(), []
+
+        async def analyze(tx_data):
+            started.set()
+            await asyncio.sleep(0.05)
+            finished.append(tx_data['hash'])
+
+        monitor._analyze_and_execute = analyze
+        monitor.apply_config(StrategyConfig(mempool_processors=1))
+        await monitor.opportunity_queue.put({'hash': '0x1'})
+        await started.wait()
+        # The only processor is busy; dropping it must still let the analysis finish
+        monitor.processor_count = 0
+        monitor._resize_processors()
+        await asyncio.sleep(0.1)
+        monitor.stop()
+        return finished, monitor.opportunity_queue._unfinished_tasks
+
+    assert asyncio.run(run()) == (['0x1'], 0)
+
+
+def test_max_gas_override_applies_per_chain():
+    monitor = make_monitor()
+    monitor.apply_config(StrategyConfig(max_gas={'ethereum': 5}))
+    assert monitor.chain_configs[Chain.ETH].max_gas == 5
+    monitor.apply_config(StrategyConfig())
+    assert monitor.chain_configs[Chain.ETH].max_gas == 100 * 10 ** 9
+    monitor.stop()
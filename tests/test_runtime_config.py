@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from runtime_config import ConfigError, RuntimeConfig, StrategyConfig
+
+
+def test_from_dict_overrides_and_coerces():
+    config = StrategyConfig.from_dict({
+        'min_profit_threshold': 2,
+        'max_gas': {'arbitrum': 2000000000},
+        'min_profit': {'arbitrum': 3}
+    })
+    assert config.min_profit_threshold == 2.0
+    assert isinstance(config.min_profit_threshold, float)
+    assert config.max_gas == {'arbitrum': 2000000000}
+    assert config.min_profit == {'arbitrum': 3.0}
+    assert config.poll_interval == StrategyConfig().poll_interval
+
+
+@pytest.mark.parametrize('data', [
+    {'unknown_key': 1},
+    {'mempool_processors': 2.5},
+    {'mempool_processors': True},
+    {'poll_interval': '0.1'},
+    {'execution_timeout': float('inf')},
+    {'poll_interval': float('nan')},
+    {'max_gas': 5},
+    {'max_gas': {'arbitrum': 0}},
+    {'min_profit': {'arbitrum': -1}},
+    {'min_profit': {'arbitrum': float('inf')}},
+    {'min_profit_threshold': -0.5},
+    {'max_slippage': 100},
+    {'circuit_breaker': 1},
+    {'bundle_window_blocks': 0},
+    {'bundle_max_legs': 1},
+    {'mempool_processors': 0},
+])
+def test_from_dict_rejects_invalid_values(data):
+    with pytest.raises(ConfigError):
+        StrategyConfig.from_dict(data)
+
+
+def test_reload_applies_valid_files_and_keeps_values_on_invalid_ones(tmp_path):
+    path = tmp_path / 'runtime_config.json'
+    path.write_text(json.dumps({'min_profit_threshold': 2.5}))
+    runtime = RuntimeConfig(str(path))
+    seen = []
+    runtime.subscribe(seen.append)
+    runtime.load()
+    assert runtime.current.min_profit_threshold == 2.5
+
+    path.write_text('{"execution_timeout": 1e400}')
+    assert not runtime.reload()
+    assert runtime.current.min_profit_threshold == 2.5
+
+    path.write_text(json.dumps({'min_profit_threshold': 4}))
+    assert runtime.reload()
+    assert [config.min_profit_threshold for config in seen][-1] == 4.0
+    # Unchanged files notify nobody
+    count = len(seen)
+    assert not runtime.reload()
+    assert len(seen) == count